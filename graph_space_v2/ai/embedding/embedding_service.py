@@ -14,6 +14,41 @@ from graph_space_v2.utils.errors.exceptions import EmbeddingError
 from graph_space_v2.utils.helpers.path_utils import ensure_dir_exists, get_data_dir
 
 
+# Storage dtypes for quantized embeddings, keyed by quantization mode
+QUANTIZED_DTYPES = {
+    "int8": np.int8,
+    "fp16": np.float16,
+}
+
+
+def quantize_embeddings(vectors: np.ndarray, mode: str = "none") -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Quantize a matrix of embeddings for compact storage.
+
+    int8 uses a symmetric per-vector scale; multiply by the scale to recover
+    approximate float values. fp16 and none need no scale.
+
+    Args:
+        vectors: Embedding matrix of shape (n, dimension)
+        mode: Quantization mode ('int8', 'fp16' or 'none')
+
+    Returns:
+        Tuple of the quantized matrix and the per-vector scales of shape
+        (n, 1), or None when the mode needs no scale
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if mode == "none":
+        return vectors, None
+    if mode == "fp16":
+        return vectors.astype(np.float16), None
+    if mode == "int8":
+        scale = np.abs(vectors).max(axis=1, keepdims=True) / 127.0
+        # Avoid dividing by zero for all-zero vectors
+        scale[scale == 0] = 1.0
+        return np.round(vectors / scale).astype(np.int8), scale
+    raise EmbeddingError(f"Unknown embedding quantization mode: {mode}")
+
+
 @dataclass
 class EmbeddingItem:
     """Class for storing item with its embedding."""
@@ -76,6 +111,8 @@ class EmbeddingService:
         # Initialize embeddings storage
         self.embeddings: Dict[str, EmbeddingItem] = {}
         self.index = None
+        # Bumped on every write so callers can tell cached searches are stale
+        self.version = 0
 
         # Load existing embeddings if available
         self._load_embeddings()
@@ -154,6 +191,44 @@ class EmbeddingService:
         )
 
         # Rebuild the index
+        self.version += 1
+        self._build_index()
+
+        # Save to disk
+        self._save_embeddings()
+
+    def store_embeddings_batch(self, ids: List[str], vectors: np.ndarray,
+                               metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Store several embeddings at once, rebuilding the index and saving only once.
+
+        Args:
+            ids: IDs for the embeddings
+            vectors: Embedding matrix of shape (len(ids), dimension)
+            metadatas: Optional metadata for each embedding, aligned with ids.
+                Quantized vectors carry a "quantization" mode and, for int8,
+                a per-vector "scale" here.
+        """
+        vectors = np.asarray(vectors)
+        # Keep quantized matrices in their compact dtype
+        if vectors.dtype not in (np.int8, np.float16):
+            vectors = vectors.astype(np.float32, copy=False)
+        if vectors.ndim != 2 or vectors.shape[0] != len(ids):
+            raise EmbeddingError(
+                f"Expected {len(ids)} embedding rows, got array of shape {vectors.shape}")
+
+        metadatas = metadatas or [{} for _ in ids]
+        for id, embedding, metadata in zip(ids, vectors, metadatas):
+            metadata = metadata or {}
+            self.embeddings[id] = EmbeddingItem(
+                id=id,
+                text=metadata.get("text", ""),
+                embedding=embedding,
+                metadata=metadata
+            )
+
+        # Rebuild the index
+        self.version += 1
         self._build_index()
 
         # Save to disk
@@ -176,16 +251,32 @@ class EmbeddingService:
 
         existing_item = self.embeddings[id]
 
-        # Update embedding
-        existing_item.embedding = embedding
-
         # Update metadata if provided
         if metadata is not None:
             existing_item.metadata.update(metadata)
             if "text" in metadata:
                 existing_item.text = metadata["text"]
 
+        # Store the new vector in the item's quantization mode so its
+        # metadata keeps describing the stored values
+        mode = existing_item.metadata.get("quantization")
+        if mode in QUANTIZED_DTYPES:
+            embedding = np.asarray(embedding)
+            if embedding.dtype != QUANTIZED_DTYPES[mode]:
+                vectors, scales = quantize_embeddings(
+                    embedding.reshape(1, -1), mode)
+                embedding = vectors[0]
+                if scales is not None:
+                    existing_item.metadata["scale"] = float(scales[0, 0])
+        else:
+            existing_item.metadata.pop("quantization", None)
+            existing_item.metadata.pop("scale", None)
+
+        # Update embedding
+        existing_item.embedding = embedding
+
         # Rebuild the index
+        self.version += 1
         self._build_index()
 
         # Save to disk
@@ -210,6 +301,7 @@ class EmbeddingService:
         del self.embeddings[id]
 
         # Rebuild the index
+        self.version += 1
         self._build_index()
 
         # Save to disk
@@ -230,7 +322,11 @@ class EmbeddingService:
         if id not in self.embeddings:
             return None
 
-        return self.embeddings[id].embedding
+        item = self.embeddings[id]
+        if item.metadata.get("quantization") in QUANTIZED_DTYPES:
+            # Dequantize back to float32 for callers
+            return item.embedding.astype(np.float32) * item.metadata.get("scale", 1.0)
+        return item.embedding
 
     def search(self, query_embedding: np.ndarray, limit: int = 5, filter_by: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -322,9 +418,10 @@ class EmbeddingService:
 
             self.index = faiss.IndexFlatL2(self.dimension)
 
-            # Add embeddings to the index
+            # Add embeddings to the index; quantized vectors are widened to
+            # float32, and the per-vector int8 scale drops out on normalization
             embeddings_array = np.stack(
-                [item.embedding for item in self.embeddings.values()])
+                [item.embedding for item in self.embeddings.values()]).astype(np.float32)
 
             # Normalize embeddings
             faiss.normalize_L2(embeddings_array)
@@ -347,11 +444,12 @@ class EmbeddingService:
 
             # Load embeddings from data
             for item_data in data:
+                dtype = QUANTIZED_DTYPES.get(
+                    item_data["metadata"].get("quantization"), np.float32)
                 item = EmbeddingItem(
                     id=item_data["id"],
                     text=item_data["text"],
-                    embedding=np.array(
-                        item_data["embedding"], dtype=np.float32),
+                    embedding=np.array(item_data["embedding"], dtype=dtype),
                     metadata=item_data["metadata"]
                 )
                 self.embeddings[item.id] = item
@@ -3,6 +3,8 @@ from flask_cors import CORS
 import os
 import datetime
 
+from graph_space_v2.utils.helpers.path_utils import get_data_dir
+
 
 def create_app(graphspace_instance=None):
     app = Flask(__name__,
@@ -13,8 +15,7 @@ def create_app(graphspace_instance=None):
     CORS(app)  # Enable CORS for all routes
 
     # Configure app
-    app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.dirname(
-        os.path.abspath(__file__))), "data", "uploads")
+    app.config['UPLOAD_FOLDER'] = os.path.join(get_data_dir(), "uploads")
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload size
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
@@ -1,17 +1,64 @@
-import json
+import copy
 import os
+from collections import deque
+from contextlib import contextmanager
 import networkx as nx
+from networkx.utils import UnionFind
 import numpy as np
-from typing import Dict, List, Any, Optional, Set, Tuple, Union
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple, Union
 from datetime import datetime
 
 from graph_space_v2.utils.errors.exceptions import KnowledgeGraphError, EntityNotFoundError
 from graph_space_v2.core.models.note import Note
 from graph_space_v2.core.models.task import Task
 from graph_space_v2.core.models.contact import Contact
+from graph_space_v2.utils.helpers.file_utils import load_json, save_json
 from graph_space_v2.utils.helpers.path_utils import get_user_data_path, ensure_dir_exists
 
 
+# Entity types in the order their nodes are added by build_graph
+_NODE_TYPES = ("note", "task", "contact", "document")
+
+
+class _EdgeTrackingGraph(nx.Graph):
+    """A networkx Graph that counts edge mutations, so labels derived from
+    the edges can tell when they are stale."""
+
+    edge_mutations = 0
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        self.edge_mutations += 1
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        self.edge_mutations += 1
+        super().add_edges_from(ebunch_to_add, **attr)
+
+    def remove_edge(self, u, v):
+        self.edge_mutations += 1
+        super().remove_edge(u, v)
+
+    def remove_edges_from(self, ebunch):
+        self.edge_mutations += 1
+        super().remove_edges_from(ebunch)
+
+    def remove_node(self, n):
+        self.edge_mutations += 1
+        super().remove_node(n)
+
+    def remove_nodes_from(self, nodes):
+        self.edge_mutations += 1
+        super().remove_nodes_from(nodes)
+
+    def clear(self):
+        self.edge_mutations += 1
+        super().clear()
+
+    def clear_edges(self):
+        self.edge_mutations += 1
+        super().clear_edges()
+
+
 class KnowledgeGraph:
     """Core knowledge graph for storing and connecting entities."""
 
@@ -23,10 +70,123 @@ class KnowledgeGraph:
             data_path: Path to the JSON file containing user data.
         """
         self.data_path = data_path
-        self.graph = nx.Graph()
+        self._graph = _EdgeTrackingGraph()
+        self._dirty = False
+        self._suspend_persist = False
+        self._save_pending = False
+        self._tag_index: Dict[str, Dict[str, None]] = {}
+        self._components: Optional[UnionFind] = None
+        self._components_stamp = 0
+        self.version = 0
         self.node_embeddings = {}
         self.data = self._load_data()
-        self.build_graph()
+        # The graph is built on first access
+        self._dirty = True
+
+    @property
+    def graph(self) -> nx.Graph:
+        """The networkx graph, rebuilt first if the data was marked dirty."""
+        if self._dirty:
+            self.build_graph()
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph: nx.Graph) -> None:
+        self._graph = graph
+        self._dirty = False
+        self._components = None
+
+        # Re-derive the tag index from the replacement graph's nodes
+        self._tag_index = {}
+        for node_id, node_data in graph.nodes(data=True):
+            self._index_tags(node_id, node_data.get("tags"))
+
+    def mark_dirty(self) -> None:
+        """
+        Flag the graph as out of date with the data.
+
+        The rebuild is deferred until the graph is next accessed, so several
+        bulk changes to the data share a single rebuild. Also bumps the data
+        version so caches derived from the data know to refresh.
+        """
+        self._dirty = True
+        self.version += 1
+
+    def union_components(self, source_node: str, target_node: str) -> None:
+        """
+        Record a new edge in the connected-component labels.
+
+        Call this after adding an edge to the graph outside of build_graph.
+
+        Args:
+            source_node: Graph node at one end of the edge
+            target_node: Graph node at the other end of the edge
+        """
+        if self._components is None:
+            return
+
+        mutations = getattr(self._graph, "edge_mutations", None)
+        if mutations is not None and mutations == self._components_stamp + 1:
+            # Exactly this edge changed since the labels were last in sync
+            self._components.union(source_node, target_node)
+            self._components_stamp = mutations
+        else:
+            # Other edges changed since the labels were built
+            self._components = None
+
+    def reset_components(self) -> None:
+        """
+        Drop the connected-component labels after edges were removed.
+
+        The labels are recomputed on the next find_path call.
+        """
+        self._components = None
+
+    def _component_labels(self) -> Optional[UnionFind]:
+        """
+        Get the union-find of connected components, building it if needed.
+
+        The labels are stamped with the graph's edge mutation counter and
+        rebuilt whenever any edge has been added or removed since, including
+        directly on the graph.
+
+        Returns:
+            The component labels, or None if the graph does not count its
+            edge mutations and so the labels can't be kept current
+        """
+        graph = self.graph
+        mutations = getattr(graph, "edge_mutations", None)
+        if mutations is None:
+            return None
+
+        if self._components is None or mutations != self._components_stamp:
+            components = UnionFind(graph.nodes)
+            for source, target in graph.edges:
+                components.union(source, target)
+            self._components = components
+            self._components_stamp = mutations
+        return self._components
+
+    @contextmanager
+    def batch(self) -> Iterator["KnowledgeGraph"]:
+        """
+        Coalesce the saves of several mutations into one write on exit.
+
+        Yields:
+            The knowledge graph itself
+        """
+        if self._suspend_persist:
+            # Nested batch: the outermost one flushes
+            yield self
+            return
+
+        self._suspend_persist = True
+        try:
+            yield self
+        finally:
+            self._suspend_persist = False
+            if self._save_pending:
+                self.save_data()
 
     def _load_data(self) -> Dict:
         """
@@ -47,26 +207,37 @@ class KnowledgeGraph:
                 "documents": []
             }
             # Save the empty structure
-            with open(self.data_path, 'w') as f:
-                json.dump(empty_data, f)
+            save_json(empty_data, self.data_path)
             return empty_data
 
-        try:
-            with open(self.data_path, 'r') as f:
-                data = json.load(f)
-                # Ensure all required keys exist
-                for key in ["notes", "tasks", "contacts", "documents"]:
-                    if key not in data:
-                        data[key] = []
-                return data
-        except json.JSONDecodeError:
+        data = load_json(self.data_path)
+        if not isinstance(data, dict):
             # Handle case where file exists but is empty or invalid
             return {"notes": [], "tasks": [], "contacts": [], "documents": []}
 
+        # Ensure all required keys exist
+        for key in ["notes", "tasks", "contacts", "documents"]:
+            if key not in data:
+                data[key] = []
+        return data
+
+    def snapshot_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get a copy of the data exactly as save_data would write it.
+
+        Returns:
+            Deep copy of the persisted data structure
+        """
+        return copy.deepcopy(self.data)
+
     def save_data(self):
         """Save the current data back to the JSON file."""
-        with open(self.data_path, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        if self._suspend_persist:
+            self._save_pending = True
+            return
+
+        self._save_pending = False
+        save_json(self.data, self.data_path)
 
     def build_graph(self):
         """
@@ -74,7 +245,10 @@ class KnowledgeGraph:
         Create nodes for all entities and edges based on relationships.
         """
         # Clear existing graph
+        self._dirty = False
         self.graph.clear()
+        self._tag_index = {}
+        self._components = None
 
         # Add nodes for each entity type
         self._add_nodes_from_data()
@@ -103,6 +277,7 @@ class KnowledgeGraph:
                 created_at=note_data.get("created_at", ""),
                 updated_at=note_data.get("updated_at", "")
             )
+            self._index_tags(node_id, note_data.get("tags"))
             node_count += 1
 
         # Add tasks
@@ -120,6 +295,7 @@ class KnowledgeGraph:
                 created_at=task_data.get("created_at", ""),
                 updated_at=task_data.get("updated_at", "")
             )
+            self._index_tags(node_id, task_data.get("tags"))
             node_count += 1
 
         # Add contacts
@@ -136,6 +312,7 @@ class KnowledgeGraph:
                 tags=contact_data.get("tags", []),
                 created_at=contact_data.get("created_at", "")
             )
+            self._index_tags(node_id, contact_data.get("tags"))
             node_count += 1
 
         # Add documents
@@ -161,6 +338,7 @@ class KnowledgeGraph:
                 created_at=doc_data.get("created_at", ""),
                 processed_at=doc_data.get("processed_at", "")
             )
+            self._index_tags(node_id, tags)
             node_count += 1
 
         print(f"Added {node_count} nodes to the knowledge graph")
@@ -172,6 +350,12 @@ class KnowledgeGraph:
             node_types[node_type] = node_types.get(node_type, 0) + 1
         print(f"Node types in graph: {node_types}")
 
+    def _index_tags(self, node_id: str, tags: Optional[List[str]]) -> None:
+        """Record a node under each of its tags in the tag index."""
+        for tag in dict.fromkeys(tags or ()):
+            # Dict keys keep insertion order and ignore duplicate node ids
+            self._tag_index.setdefault(tag, {})[node_id] = None
+
     def _add_edges_for_notes(self):
         """Add edges between notes based on shared tags and other relationships."""
         notes_nodes = [n for n, attr in self.graph.nodes(
@@ -448,25 +632,54 @@ class KnowledgeGraph:
         Returns:
             ID of the new note
         """
-        # Ensure note has an ID
-        if "id" not in note_data:
-            if isinstance(note_data, Note):
-                note_data = note_data.to_dict()
-            else:
-                note = Note.from_dict(note_data)
-                note_data = note.to_dict()
+        note_data = self._prepare_note(note_data)
 
         # Add to data structure
         self.data["notes"].append(note_data)
 
-        # Rebuild the graph to include the new note
-        self.build_graph()
+        # Rebuild the graph on next access to include the new note
+        self.mark_dirty()
 
         # Save data
         self.save_data()
 
         return note_data["id"]
 
+    def add_notes(self, notes: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several notes, rebuilding the graph and saving only once.
+
+        Args:
+            notes: List of dictionaries with note data
+
+        Returns:
+            IDs of the new notes, in input order
+        """
+        prepared = [self._prepare_note(note_data) for note_data in notes]
+        if not prepared:
+            return []
+
+        # Add to data structure
+        self.data["notes"].extend(prepared)
+
+        # Rebuild the graph once for the whole batch, on next access
+        self.mark_dirty()
+
+        # Save data
+        self.save_data()
+
+        return [note_data["id"] for note_data in prepared]
+
+    def _prepare_note(self, note_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Ensure note data has an ID, normalizing it through the Note model."""
+        if "id" not in note_data:
+            if isinstance(note_data, Note):
+                note_data = note_data.to_dict()
+            else:
+                note = Note.from_dict(note_data)
+                note_data = note.to_dict()
+        return note_data
+
     def update_note(self, note_id: str, note_data: Dict[str, Any]) -> bool:
         """
         Update an existing note.
@@ -490,8 +703,8 @@ class KnowledgeGraph:
                 # Update data structure
                 self.data["notes"][i] = note
 
-                # Rebuild graph
-                self.build_graph()
+                # Rebuild graph on next access
+                self.mark_dirty()
 
                 # Save data
                 self.save_data()
@@ -515,8 +728,8 @@ class KnowledgeGraph:
                 # Remove from data structure
                 self.data["notes"].pop(i)
 
-                # Rebuild graph
-                self.build_graph()
+                # Rebuild graph on next access
+                self.mark_dirty()
 
                 # Save data
                 self.save_data()
@@ -562,8 +775,8 @@ class KnowledgeGraph:
         # Add to data structure
         self.data["tasks"].append(task_data)
 
-        # Rebuild the graph to include the new task
-        self.build_graph()
+        # Rebuild the graph on next access to include the new task
+        self.mark_dirty()
 
         # Save data
         self.save_data()
@@ -583,6 +796,9 @@ class KnowledgeGraph:
         """
         for i, task in enumerate(self.data["tasks"]):
             if task.get("id") == task_id:
+                # Invalidate indexes derived from the data before changing it
+                self.mark_dirty()
+
                 # Update the task
                 for key, value in task_data.items():
                     task[key] = value
@@ -593,9 +809,6 @@ class KnowledgeGraph:
                 # Update data structure
                 self.data["tasks"][i] = task
 
-                # Rebuild graph
-                self.build_graph()
-
                 # Save data
                 self.save_data()
 
@@ -615,12 +828,12 @@ class KnowledgeGraph:
         """
         for i, task in enumerate(self.data["tasks"]):
             if task.get("id") == task_id:
+                # Invalidate indexes derived from the data before changing it
+                self.mark_dirty()
+
                 # Remove from data structure
                 self.data["tasks"].pop(i)
 
-                # Rebuild graph
-                self.build_graph()
-
                 # Save data
                 self.save_data()
 
@@ -665,8 +878,8 @@ class KnowledgeGraph:
         # Add to data structure
         self.data["contacts"].append(contact_data)
 
-        # Rebuild the graph to include the new contact
-        self.build_graph()
+        # Rebuild the graph on next access to include the new contact
+        self.mark_dirty()
 
         # Save data
         self.save_data()
@@ -723,16 +936,18 @@ class KnowledgeGraph:
         Returns:
             List of entities that have the tag
         """
+        # Accessing the graph first applies any pending rebuild to the index
+        nodes = self.graph.nodes
         results = []
 
-        for node_id, data in self.graph.nodes(data=True):
-            if tag in data.get("tags", []):
-                entity_id = node_id.split("_")[1]
-                results.append({
-                    "id": entity_id,
-                    "type": data["type"],
-                    "data": data["data"]
-                })
+        for node_id in self._tag_index.get(tag, ()):
+            data = nodes[node_id]
+            entity_id = node_id.split("_")[1]
+            results.append({
+                "id": entity_id,
+                "type": data["type"],
+                "data": data["data"]
+            })
 
         return results
 
@@ -760,14 +975,19 @@ class KnowledgeGraph:
             raise EntityNotFoundError(
                 f"Entity {end_type} with ID {end_id} not found")
 
-        try:
-            path = nx.shortest_path(self.graph, start_node, end_node)
-        except nx.NetworkXNoPath:
+        # Entities in different components can never be connected
+        components = self._component_labels()
+        if components is not None and components[start_node] != components[end_node]:
+            return []
+
+        path = self._bfs_path(start_node, end_node)
+        if not path:
             return []
 
+        graph = self.graph
         result = []
-        for node in path:
-            node_data = self.graph.nodes[node]
+        for node, next_node in zip(path, path[1:] + [None]):
+            node_data = graph.nodes[node]
             entity_id = node.split("_")[1]
             result.append({
                 "id": entity_id,
@@ -776,13 +996,44 @@ class KnowledgeGraph:
             })
 
             # Add relationship data if not the last node
-            if node != path[-1]:
-                next_node = path[path.index(node) + 1]
-                edge_data = self.graph.get_edge_data(node, next_node)
-                result[-1]["next_relationship"] = edge_data
+            if next_node is not None:
+                result[-1]["next_relationship"] = graph.get_edge_data(
+                    node, next_node)
 
         return result
 
+    def _bfs_path(self, start_node: str, end_node: str) -> List[str]:
+        """
+        Breadth-first search for an unweighted shortest path.
+
+        Args:
+            start_node: Graph node to start from
+            end_node: Graph node to reach
+
+        Returns:
+            Node IDs from start to end, or an empty list if unreachable
+        """
+        adj = self.graph.adj
+        parent: Dict[str, Optional[str]] = {start_node: None}
+        queue = deque([start_node])
+
+        while queue:
+            node = queue.popleft()
+            if node == end_node:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                path.reverse()
+                return path
+
+            for neighbor in adj[node]:
+                if neighbor not in parent:
+                    parent[neighbor] = node
+                    queue.append(neighbor)
+
+        return []
+
     def add_relationship(self, source_id: str, target_id: str, relationship_type: str,
                          properties: Optional[Dict[str, Any]] = None) -> bool:
         """
@@ -823,6 +1074,7 @@ class KnowledgeGraph:
 
         try:
             self.graph.add_edge(source_node_id, target_node_id, **props)
+            self.union_components(source_node_id, target_node_id)
             return True
         except Exception:
             return False
@@ -870,8 +1122,8 @@ class KnowledgeGraph:
         if not entity_found:
             return False
 
-        # Rebuild the graph to reflect changes
-        self.build_graph()
+        # Rebuild the graph on next access to reflect changes
+        self.mark_dirty()
 
         # Save changes
         self.save_data()
@@ -924,8 +1176,8 @@ class KnowledgeGraph:
         if not entity_found:
             return False
 
-        # Rebuild the graph to reflect changes
-        self.build_graph()
+        # Rebuild the graph on next access to reflect changes
+        self.mark_dirty()
 
         # Save changes
         self.save_data()
@@ -942,22 +1194,27 @@ class KnowledgeGraph:
         Returns:
             True if successful, False otherwise
         """
-        # Find the node in the graph
+        # Find the node in the graph; node IDs are always "<type>_<id>"
+        adj = self.graph.adj
         node_id = None
-        for n in self.graph.nodes:
-            if n.endswith(f"_{entity_id}"):
-                node_id = n
+        for entity_type in _NODE_TYPES:
+            candidate = f"{entity_type}_{entity_id}"
+            if candidate in adj:
+                node_id = candidate
                 break
 
         if not node_id:
             return False
 
         # Get all neighbors before removing edges
-        neighbors = list(self.graph.neighbors(node_id))
+        neighbors = list(adj[node_id])
 
         # Remove all edges to neighbors
-        for neighbor in neighbors:
-            self.graph.remove_edge(node_id, neighbor)
+        self.graph.remove_edges_from(
+            (node_id, neighbor) for neighbor in neighbors)
+
+        if neighbors:
+            self.reset_components()
 
         return True
 
@@ -984,15 +1241,15 @@ class KnowledgeGraph:
         for i, doc in enumerate(self.data["documents"]):
             if doc.get("id") == document_data["id"]:
                 self.data["documents"][i] = document_data
-                self.build_graph()  # Rebuild the graph
+                self.mark_dirty()  # Rebuild the graph on next access
                 self.save_data()
                 return document_data["id"]
 
         # Add document to data structure
         self.data["documents"].append(document_data)
 
-        # Rebuild the graph to include the new document
-        self.build_graph()
+        # Rebuild the graph on next access to include the new document
+        self.mark_dirty()
 
         # Save data
         self.save_data()
@@ -209,6 +209,8 @@ class NodeManager:
         try:
             self.knowledge_graph.graph.add_edge(
                 source_node_id, target_node_id, **attributes)
+            self.knowledge_graph.union_components(
+                source_node_id, target_node_id)
             return True
         except Exception:
             return False
@@ -232,6 +234,7 @@ class NodeManager:
         try:
             self.knowledge_graph.graph.remove_edge(
                 source_node_id, target_node_id)
+            self.knowledge_graph.reset_components()
             return True
         except Exception:
             return False
@@ -274,8 +277,8 @@ class NodeManager:
                 # Update data structure
                 self.knowledge_graph.data["contacts"][i] = contact
 
-                # Rebuild graph
-                self.knowledge_graph.build_graph()
+                # Rebuild graph on next access
+                self.knowledge_graph.mark_dirty()
 
                 # Save data
                 self.knowledge_graph.save_data()
@@ -299,8 +302,8 @@ class NodeManager:
                 # Remove from data structure
                 self.knowledge_graph.data["contacts"].pop(i)
 
-                # Rebuild graph
-                self.knowledge_graph.build_graph()
+                # Rebuild graph on next access
+                self.knowledge_graph.mark_dirty()
 
                 # Save data
                 self.knowledge_graph.save_data()
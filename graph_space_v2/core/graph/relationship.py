@@ -167,6 +167,7 @@ class RelationshipManager:
         # Add the edge to the graph
         self.knowledge_graph.graph.add_edge(
             source_node_id, target_node_id, **edge_attrs)
+        self.knowledge_graph.union_components(source_node_id, target_node_id)
 
         return True
 
@@ -186,6 +187,7 @@ class RelationshipManager:
         try:
             self.knowledge_graph.graph.remove_edge(
                 source_node_id, target_node_id)
+            self.knowledge_graph.reset_components()
             return True
         except Exception:
             return False
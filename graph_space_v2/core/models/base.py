@@ -1,15 +1,32 @@
 from typing import Dict, Any, List, Optional, Set, ClassVar
 import uuid
 from datetime import datetime
+from operator import attrgetter
 import json
 
 
 class BaseModel:
     """Base class for all models in the system."""
 
+    __slots__ = ('id', 'created_at', 'updated_at')
+
     # Fields that should be included in serialization
     fields: ClassVar[Set[str]] = {'id', 'created_at', 'updated_at'}
 
+    # Ordered field names and a C-level getter for them, set per class
+    _field_names: ClassVar[tuple] = ()
+    _field_getter: ClassVar[attrgetter]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._bind_field_getter()
+
+    @classmethod
+    def _bind_field_getter(cls) -> None:
+        """Precompute the getter used by to_dict for this class's fields."""
+        cls._field_names = tuple(sorted(cls.fields))
+        cls._field_getter = attrgetter(*cls._field_names)
+
     def __init__(
         self,
         id: Optional[str] = None,
@@ -37,11 +54,15 @@ class BaseModel:
         Returns:
             Dictionary representation of the model
         """
-        return {
-            field: getattr(self, field)
-            for field in self.fields
-            if hasattr(self, field)
-        }
+        try:
+            return dict(zip(self._field_names, self._field_getter(self)))
+        except AttributeError:
+            # Some fields were never set; include only the present ones
+            return {
+                field: getattr(self, field)
+                for field in self._field_names
+                if hasattr(self, field)
+            }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'BaseModel':
@@ -54,9 +75,8 @@ class BaseModel:
         Returns:
             Model instance
         """
-        # Create a shallow copy to avoid modifying the original
-        data_copy = data.copy()
-        return cls(**data_copy)
+        # Keyword unpacking already builds a new dict, so the input is never modified
+        return cls(**data)
 
     def to_json(self) -> str:
         """
@@ -113,3 +133,6 @@ class BaseModel:
                 attrs.append(f"{field}={value!r}")
 
         return f"{self.__class__.__name__}({', '.join(attrs)})"
+
+
+BaseModel._bind_field_getter()
@@ -1,12 +1,39 @@
 from typing import Dict, Any, List, Optional, Set, ClassVar, Union
 from datetime import datetime, timedelta
+from functools import lru_cache
 import datetime as dt
 from graph_space_v2.core.models.base import BaseModel
 
 
+@lru_cache(maxsize=1024)
+def parse_iso(value: str) -> datetime:
+    """
+    Parse an ISO format timestamp, memoized on the string.
+
+    A trailing "Z" is accepted as UTC.
+
+    Args:
+        value: ISO format date string
+
+    Returns:
+        Parsed datetime
+
+    Raises:
+        ValueError: If the string is not a valid ISO timestamp
+    """
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 class Task(BaseModel):
     """Model representing a task in the system."""
 
+    __slots__ = (
+        'title', 'description', 'status', 'due_date', 'priority', 'tags',
+        'project', 'is_recurring', 'recurrence_frequency', 'recurrence_start_date',
+        'recurrence_next_run', 'recurrence_enabled', 'calendar_sync',
+        'calendar_id', 'calendar_provider'
+    )
+
     # Task status constants
     STATUS_PENDING = "pending"
     STATUS_IN_PROGRESS = "in_progress"
@@ -31,6 +58,13 @@ class Task(BaseModel):
         'calendar_id', 'calendar_provider'
     })
 
+    # Fields that update() copies from its input
+    _updatable_fields: ClassVar[frozenset] = frozenset({
+        'title', 'description', 'status', 'due_date', 'priority', 'tags',
+        'project', 'is_recurring', 'recurrence_frequency', 'recurrence_start_date',
+        'recurrence_enabled', 'calendar_sync', 'calendar_id', 'calendar_provider'
+    })
+
     def __init__(
         self,
         id: Optional[str] = None,
@@ -114,39 +148,11 @@ class Task(BaseModel):
         Args:
             data: Dictionary containing fields to update
         """
-        # Update basic fields
-        if 'title' in data:
-            self.title = data['title']
-        if 'description' in data:
-            self.description = data['description']
-        if 'status' in data:
-            self.status = data['status']
-        if 'due_date' in data:
-            self.due_date = data['due_date']
-        if 'priority' in data:
-            self.priority = data['priority']
-        if 'tags' in data:
-            self.tags = data['tags']
-        if 'project' in data:
-            self.project = data['project']
-
-        # Update recurrence fields
-        if 'is_recurring' in data:
-            self.is_recurring = data['is_recurring']
-        if 'recurrence_frequency' in data:
-            self.recurrence_frequency = data['recurrence_frequency']
-        if 'recurrence_start_date' in data:
-            self.recurrence_start_date = data['recurrence_start_date']
-        if 'recurrence_enabled' in data:
-            self.recurrence_enabled = data['recurrence_enabled']
-
-        # Update calendar fields
-        if 'calendar_sync' in data:
-            self.calendar_sync = data['calendar_sync']
-        if 'calendar_id' in data:
-            self.calendar_id = data['calendar_id']
-        if 'calendar_provider' in data:
-            self.calendar_provider = data['calendar_provider']
+        now = datetime.now()
+
+        for key, value in data.items():
+            if key in self._updatable_fields:
+                setattr(self, key, value)
 
         # Recalculate next run date if needed
         if self.is_recurring and (
@@ -157,7 +163,7 @@ class Task(BaseModel):
             self.recurrence_next_run = self.calculate_next_recurrence()
 
         # Always update the updated_at timestamp
-        self.updated_at = datetime.now().isoformat()
+        self.updated_at = now.isoformat()
 
     def mark_completed(self) -> None:
         """
@@ -191,7 +197,7 @@ class Task(BaseModel):
         )
 
         try:
-            base_date = datetime.fromisoformat(start_date)
+            base_date = parse_iso(start_date)
         except ValueError:
             # Handle date format issue, default to now
             base_date = datetime.now()
@@ -1,14 +1,16 @@
-from typing import Dict, List, Any, Optional, Set, Union
+from typing import Dict, List, Any, Optional, Set, Union, TYPE_CHECKING
 from datetime import datetime
 import uuid
 import traceback
 
 from graph_space_v2.core.models.note import Note
 from graph_space_v2.core.graph.knowledge_graph import KnowledgeGraph
-from graph_space_v2.ai.embedding.embedding_service import EmbeddingService
-from graph_space_v2.ai.llm.llm_service import LLMService
 from graph_space_v2.utils.errors.exceptions import EntityNotFoundError
 
+if TYPE_CHECKING:
+    from graph_space_v2.ai.embedding.embedding_service import EmbeddingService
+    from graph_space_v2.ai.llm.llm_service import LLMService
+
 
 class NoteService:
     """Service class for note-related operations."""
@@ -16,8 +18,8 @@ class NoteService:
     def __init__(
         self,
         knowledge_graph: KnowledgeGraph,
-        embedding_service: Optional[EmbeddingService] = None,
-        llm_service: Optional[LLMService] = None
+        embedding_service: Optional["EmbeddingService"] = None,
+        llm_service: Optional["LLMService"] = None
     ):
         """
         Initialize the NoteService.
@@ -133,10 +135,7 @@ class NoteService:
         Returns:
             Updated Note instance or None if not found
         """
-        # Set the updated_at timestamp
-        note_data["updated_at"] = datetime.now().isoformat()
-
-        # Update the note in the knowledge graph
+        # Update the note in the knowledge graph, which stamps updated_at
         success = self.knowledge_graph.update_note(note_id, note_data)
 
         if success:
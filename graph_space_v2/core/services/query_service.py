@@ -1,12 +1,30 @@
-from typing import Dict, List, Any, Optional, Set, Union
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, TYPE_CHECKING
 import networkx as nx
+import numpy as np
 from datetime import datetime
 
 from graph_space_v2.core.graph.knowledge_graph import KnowledgeGraph
-from graph_space_v2.ai.embedding.embedding_service import EmbeddingService
-from graph_space_v2.ai.llm.llm_service import LLMService
 from graph_space_v2.utils.errors.exceptions import EntityNotFoundError
 
+if TYPE_CHECKING:
+    from graph_space_v2.ai.embedding.embedding_service import EmbeddingService
+    from graph_space_v2.ai.llm.llm_service import LLMService
+
+
+# Length of the substrings posted in the text search index
+_NGRAM_SIZE = 3
+
+# Entity collections in the order text search results are ranked on ties
+_SEARCH_COLLECTIONS = (("note", "notes"), ("task", "tasks"), ("contact", "contacts"))
+
+# Searchable fields and their score weights for each entity type
+_SEARCH_FIELDS = {
+    "note": (("title", 3.0), ("content", 2.0)),
+    "task": (("title", 3.0), ("description", 2.0)),
+    "contact": (("name", 3.0), ("email", 2.0), ("organization", 1.5)),
+}
+
 
 class QueryService:
     """Service for querying the knowledge graph."""
@@ -14,8 +32,10 @@ class QueryService:
     def __init__(
         self,
         knowledge_graph: KnowledgeGraph,
-        embedding_service: Optional[EmbeddingService] = None,
-        llm_service: Optional[LLMService] = None
+        embedding_service: Optional["EmbeddingService"] = None,
+        llm_service: Optional["LLMService"] = None,
+        semantic_cache_size: int = 0,
+        semantic_cache_threshold: float = 0.97
     ):
         """
         Initialize the QueryService.
@@ -24,10 +44,18 @@ class QueryService:
             knowledge_graph: The knowledge graph instance
             embedding_service: Optional embedding service for semantic queries
             llm_service: Optional LLM service for natural language queries
+            semantic_cache_size: Number of semantic search results to cache (0 disables the cache)
+            semantic_cache_threshold: Minimum cosine similarity for a cached query to be reused
         """
         self.knowledge_graph = knowledge_graph
         self.embedding_service = embedding_service
         self.llm_service = llm_service
+        self._search_indexes: Dict[str, Tuple[List[Tuple[Dict[str, Any], List[Tuple[str, float]], List[str]]], Dict[str, List[int]]]] = {}
+        self._search_index_version = None
+        self.semantic_cache_size = semantic_cache_size
+        self.semantic_cache_threshold = semantic_cache_threshold
+        self._semantic_cache: "OrderedDict[Tuple, Tuple[Optional[np.ndarray], List[Dict[str, Any]]]]" = OrderedDict()
+        self._semantic_cache_version = None
 
     def semantic_search(self, query: str, entity_types: Optional[List[str]] = None, max_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -45,9 +73,20 @@ class QueryService:
             return self.text_search(query, entity_types, max_results)
 
         try:
+            scope = (tuple(entity_types) if entity_types else None, max_results)
+            if self.semantic_cache_size > 0:
+                cached = self._semantic_cache_get(scope, query)
+                if cached is not None:
+                    return cached
+
             # Embed the query
             query_embedding = self.embedding_service.embed_text(query)
 
+            if self.semantic_cache_size > 0:
+                cached = self._semantic_cache_match(scope, query_embedding)
+                if cached is not None:
+                    return cached
+
             # Prepare filter
             filter_by = {}
             if entity_types:
@@ -73,12 +112,75 @@ class QueryService:
                         "snippet": self._generate_snippet(entity, query)
                     })
 
+            if self.semantic_cache_size > 0:
+                self._semantic_cache_put(
+                    scope, query, query_embedding, enriched_results)
+
             return enriched_results
 
         except Exception as e:
             print(f"Error in semantic search: {e}")
             return self.text_search(query, entity_types, max_results)
 
+    def _semantic_cache_get(self, scope: Tuple, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Look up cached results for the exact query, dropping stale entries."""
+        version = (self.knowledge_graph.version, id(self.knowledge_graph.data),
+                   getattr(self.embedding_service, "version", None))
+        if self._semantic_cache_version != version:
+            self._semantic_cache.clear()
+            self._semantic_cache_version = version
+            return None
+
+        key = (scope, query)
+        entry = self._semantic_cache.get(key)
+        if entry is None:
+            return None
+        self._semantic_cache.move_to_end(key)
+        return list(entry[1])
+
+    def _semantic_cache_match(self, scope: Tuple, query_embedding: Any) -> Optional[List[Dict[str, Any]]]:
+        """Find cached results for a query whose embedding is close enough."""
+        query_vector = self._unit_vector(query_embedding)
+        if query_vector is None:
+            return None
+
+        keys = []
+        vectors = []
+        for key, (vector, _) in self._semantic_cache.items():
+            if key[0] == scope and vector is not None and vector.shape == query_vector.shape:
+                keys.append(key)
+                vectors.append(vector)
+        if not vectors:
+            return None
+
+        similarities = np.stack(vectors) @ query_vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.semantic_cache_threshold:
+            return None
+
+        key = keys[best]
+        self._semantic_cache.move_to_end(key)
+        return list(self._semantic_cache[key][1])
+
+    def _semantic_cache_put(self, scope: Tuple, query: str, query_embedding: Any, results: List[Dict[str, Any]]) -> None:
+        """Store results for a query, evicting the least recently used entry."""
+        self._semantic_cache[(scope, query)] = (
+            self._unit_vector(query_embedding), list(results))
+        while len(self._semantic_cache) > self.semantic_cache_size:
+            self._semantic_cache.popitem(last=False)
+
+    @staticmethod
+    def _unit_vector(embedding: Any) -> Optional[np.ndarray]:
+        """Normalize an embedding for cosine comparison, or None if it is not numeric."""
+        try:
+            vector = np.asarray(embedding, dtype=np.float32).ravel()
+        except (TypeError, ValueError):
+            return None
+        norm = np.linalg.norm(vector)
+        if not vector.size or not norm:
+            return None
+        return vector / norm
+
     def text_search(self, query: str, entity_types: Optional[List[str]] = None, max_results: int = 5) -> List[Dict[str, Any]]:
         """
         Perform a text-based search across the knowledge graph.
@@ -98,90 +200,115 @@ class QueryService:
         types_to_search = entity_types if entity_types else [
             "note", "task", "contact"]
 
-        # Search notes
-        if "note" in types_to_search:
-            for note in self.knowledge_graph.data.get("notes", []):
-                score = self._calculate_text_match_score(note, query, "note")
-                if score > 0:
-                    results.append({
-                        "id": note["id"],
-                        "type": "note",
-                        "entity": note,
-                        "score": score,
-                        "snippet": self._generate_snippet_for_note(note, query)
-                    })
+        for entity_type, _ in _SEARCH_COLLECTIONS:
+            if entity_type not in types_to_search:
+                continue
+
+            entries, postings = self._get_search_index(entity_type)
+
+            # Any field containing the query contains each of its n-grams, so
+            # only the entities posted under all of them need scoring
+            if len(query) >= _NGRAM_SIZE:
+                candidates = None
+                for ngram in self._ngrams(query):
+                    positions = postings.get(ngram)
+                    if positions is None:
+                        candidates = ()
+                        break
+                    candidates = set(positions) if candidates is None else candidates.intersection(positions)
+                    if not candidates:
+                        break
+                candidates = sorted(candidates)
+            else:
+                candidates = range(len(entries))
+
+            for position in candidates:
+                entity, fields, tags = entries[position]
+
+                score = 0.0
+                for text, weight in fields:
+                    if query in text:
+                        score += weight
+
+                # Score for tag match (common across all entity types)
+                if any(query in tag for tag in tags):
+                    score += 1.0
 
-        # Search tasks
-        if "task" in types_to_search:
-            for task in self.knowledge_graph.data.get("tasks", []):
-                score = self._calculate_text_match_score(task, query, "task")
                 if score > 0:
                     results.append({
-                        "id": task["id"],
-                        "type": "task",
-                        "entity": task,
-                        "score": score,
-                        "snippet": self._generate_snippet_for_task(task, query)
-                    })
-
-        # Search contacts
-        if "contact" in types_to_search:
-            for contact in self.knowledge_graph.data.get("contacts", []):
-                score = self._calculate_text_match_score(
-                    contact, query, "contact")
-                if score > 0:
-                    results.append({
-                        "id": contact["id"],
-                        "type": "contact",
-                        "entity": contact,
+                        "id": entity["id"],
+                        "type": entity_type,
+                        "entity": entity,
                         "score": score,
-                        "snippet": self._generate_snippet_for_contact(contact, query)
+                        "snippet": self._snippet_generators[entity_type](self, entity, query)
                     })
 
         # Sort by score and limit results
         results.sort(key=lambda x: x["score"], reverse=True)
         return results[:max_results]
 
-    def _calculate_text_match_score(self, entity: Dict[str, Any], query: str, entity_type: str) -> float:
-        """Calculate text match score for an entity."""
-        score = 0.0
-
-        if entity_type == "note":
-            # Score for title match
-            if "title" in entity and query in entity["title"].lower():
-                score += 3.0
-
-            # Score for content match
-            if "content" in entity and query in entity["content"].lower():
-                score += 2.0
+    def _get_search_index(self, entity_type: str) -> Tuple[List[Tuple[Dict[str, Any], List[Tuple[str, float]], List[str]]], Dict[str, List[int]]]:
+        """
+        Get the text search index for one entity type, building it if needed.
 
-        elif entity_type == "task":
-            # Score for title match
-            if "title" in entity and query in entity["title"].lower():
-                score += 3.0
+        All indexes are dropped when the graph changes, and each is rebuilt
+        only once a search asks for its entity type.
 
-            # Score for description match
-            if "description" in entity and query in entity["description"].lower():
-                score += 2.0
+        Args:
+            entity_type: Type of entity ('note', 'task', 'contact')
 
-        elif entity_type == "contact":
-            # Score for name match
-            if "name" in entity and query in entity["name"].lower():
-                score += 3.0
+        Returns:
+            Tuple of the indexed entries and the n-gram posting lists
+        """
+        version = (self.knowledge_graph.version, id(self.knowledge_graph.data))
+        if self._search_index_version != version:
+            self._search_indexes = {}
+            self._search_index_version = version
 
-            # Score for email match
-            if "email" in entity and query in entity["email"].lower():
-                score += 2.0
+        index = self._search_indexes.get(entity_type)
+        if index is None:
+            index = self._search_indexes[entity_type] = self._build_index(entity_type)
+        return index
 
-            # Score for organization match
-            if "organization" in entity and query in entity["organization"].lower():
-                score += 1.5
+    def _build_index(self, entity_type: str) -> Tuple[List[Tuple[Dict[str, Any], List[Tuple[str, float]], List[str]]], Dict[str, List[int]]]:
+        """
+        Build the lowercased search fields and n-gram postings for one entity type.
 
-        # Score for tag match (common across all entity types)
-        if "tags" in entity and any(query in tag.lower() for tag in entity["tags"]):
-            score += 1.0
+        Args:
+            entity_type: Type of entity ('note', 'task', 'contact')
 
-        return score
+        Returns:
+            Tuple of the indexed entries and the n-gram posting lists
+        """
+        collection = dict(_SEARCH_COLLECTIONS)[entity_type]
+        entries = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+
+        for entity in self.knowledge_graph.data.get(collection, []):
+            fields = [
+                (str(entity[field] or "").lower(), weight)
+                for field, weight in _SEARCH_FIELDS[entity_type]
+                if field in entity
+            ]
+            tags = [str(tag).lower() for tag in entity.get("tags") or ()]
+
+            position = len(entries)
+            entries.append((entity, fields, tags))
+
+            ngrams = set()
+            for text, _ in fields:
+                ngrams.update(self._ngrams(text))
+            for tag in tags:
+                ngrams.update(self._ngrams(tag))
+            for ngram in ngrams:
+                postings[ngram].append(position)
+
+        return entries, dict(postings)
+
+    @staticmethod
+    def _ngrams(text: str) -> Set[str]:
+        """Get the distinct substrings of text posted in the search index."""
+        return {text[i:i + _NGRAM_SIZE] for i in range(len(text) - _NGRAM_SIZE + 1)}
 
     def _get_entity(self, entity_type: str, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get entity by type and ID."""
@@ -235,6 +362,12 @@ class QueryService:
 
         return ", ".join(fields)
 
+    _snippet_generators = {
+        "note": _generate_snippet_for_note,
+        "task": _generate_snippet_for_task,
+        "contact": _generate_snippet_for_contact,
+    }
+
     def _extract_snippet(self, content: str, query: str, context_size: int = 50) -> str:
         """Extract a snippet from content around the query match."""
         if not content:
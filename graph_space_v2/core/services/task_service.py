@@ -1,50 +1,34 @@
-from typing import Dict, List, Any, Optional, Set, Union
+from typing import Dict, List, Any, Optional, Set, Union, TYPE_CHECKING
+from collections import defaultdict
 from datetime import datetime, timedelta
 import uuid
 
-from graph_space_v2.core.models.task import Task
+import numpy as np
+
+from graph_space_v2.core.models.task import Task, parse_iso
 from graph_space_v2.core.graph.knowledge_graph import KnowledgeGraph
-from graph_space_v2.ai.embedding.embedding_service import EmbeddingService
-from graph_space_v2.ai.llm.llm_service import LLMService
 from graph_space_v2.utils.errors.exceptions import EntityNotFoundError
 
+if TYPE_CHECKING:
+    from graph_space_v2.ai.embedding.embedding_service import EmbeddingService
+    from graph_space_v2.ai.llm.llm_service import LLMService
+
 
 class TaskService:
     def __init__(
         self,
         knowledge_graph: KnowledgeGraph,
-        embedding_service: Optional[EmbeddingService] = None,
-        llm_service: Optional[LLMService] = None
+        embedding_service: Optional["EmbeddingService"] = None,
+        llm_service: Optional["LLMService"] = None
     ):
         self.knowledge_graph = knowledge_graph
         self.embedding_service = embedding_service
         self.llm_service = llm_service
+        self._index: Optional[Dict[str, Any]] = None
+        self._index_version = None
 
     def add_task(self, task_data: Dict[str, Any]) -> str:
-        if isinstance(task_data, Task):
-            task = task_data
-            task_data = task.to_dict()
-        else:
-            # Generate title using LLM if available and not provided
-            if self.llm_service and not task_data.get("title") and task_data.get("description"):
-                title = self.llm_service.generate_title(
-                    task_data["description"])
-                task_data["title"] = title or "Untitled Task"
-
-            # Generate tags using LLM if available and not provided
-            if self.llm_service and not task_data.get("tags") and task_data.get("description"):
-                tags = self.llm_service.extract_tags(task_data["description"])
-                task_data["tags"] = tags
-
-            # Set timestamps if not provided
-            now = datetime.now().isoformat()
-            if not task_data.get("created_at"):
-                task_data["created_at"] = now
-            if not task_data.get("updated_at"):
-                task_data["updated_at"] = now
-
-            task = Task.from_dict(task_data)
-            task_data = task.to_dict()
+        task_data = self._prepare_task(task_data)
 
         # Create embeddings if available and description is provided
         if self.embedding_service and task_data.get("description"):
@@ -59,6 +43,59 @@ class TaskService:
         # Add to knowledge graph
         return self.knowledge_graph.add_task(task_data)
 
+    def add_tasks(self, items: List[Union[Dict[str, Any], Task]]) -> List[str]:
+        """Add several tasks with one embedding request and one save.
+
+        Args:
+            items: Task dictionaries or :class:`Task` instances.
+
+        Returns:
+            List[str]: IDs of the added tasks, in input order.
+        """
+        prepared = [self._prepare_task(item) for item in items]
+
+        # Embed all descriptions in a single request
+        to_embed = [task_data for task_data in prepared if task_data.get("description")]
+        if self.embedding_service and to_embed:
+            try:
+                embeddings = self.embedding_service.embed_texts(
+                    [task_data["description"] for task_data in to_embed])
+                self.embedding_service.store_embeddings_batch(
+                    [task_data["id"] for task_data in to_embed],
+                    embeddings,
+                    [{"type": "task"} for _ in to_embed])
+            except Exception as e:
+                print(f"Error creating embeddings: {e}")
+
+        # Add to knowledge graph, saving once at the end
+        with self.knowledge_graph.batch():
+            return [self.knowledge_graph.add_task(task_data) for task_data in prepared]
+
+    def _prepare_task(self, task_data: Union[Dict[str, Any], Task]) -> Dict[str, Any]:
+        """Normalize a new task, filling in LLM-generated fields and timestamps."""
+        if isinstance(task_data, Task):
+            return task_data.to_dict()
+
+        # Generate title using LLM if available and not provided
+        if self.llm_service and not task_data.get("title") and task_data.get("description"):
+            title = self.llm_service.generate_title(
+                task_data["description"])
+            task_data["title"] = title or "Untitled Task"
+
+        # Generate tags using LLM if available and not provided
+        if self.llm_service and not task_data.get("tags") and task_data.get("description"):
+            tags = self.llm_service.extract_tags(task_data["description"])
+            task_data["tags"] = tags
+
+        # Set timestamps if not provided
+        now = datetime.now().isoformat()
+        if not task_data.get("created_at"):
+            task_data["created_at"] = now
+        if not task_data.get("updated_at"):
+            task_data["updated_at"] = now
+
+        return Task.from_dict(task_data).to_dict()
+
     def get_task(self, task_id: str) -> Optional[Task]:
         task_data = self.knowledge_graph.get_task(task_id)
         if task_data:
@@ -79,10 +116,7 @@ class TaskService:
         ]
 
     def update_task(self, task_id: str, task_data: Dict[str, Any]) -> Optional[Task]:
-        # Set the updated_at timestamp
-        task_data["updated_at"] = datetime.now().isoformat()
-
-        # Update the task in the knowledge graph
+        # Update the task in the knowledge graph, which stamps updated_at
         success = self.knowledge_graph.update_task(task_id, task_data)
 
         if success:
@@ -112,32 +146,121 @@ class TaskService:
         return self.knowledge_graph.delete_task(task_id)
 
     def get_tasks_by_status(self, status: str) -> List[Task]:
-        return [task for task in self.get_all_tasks() if task.status == status]
+        return self._tasks_at(
+            self._get_index()["by_status"].get(status, ()),
+            lambda task_data: task_data.get("status", Task.STATUS_PENDING) == status)
 
     def get_tasks_by_project(self, project: str) -> List[Task]:
-        return [task for task in self.get_all_tasks() if task.project == project]
+        return self._tasks_at(
+            self._get_index()["by_project"].get(project, ()),
+            lambda task_data: task_data.get("project", "") == project)
 
     def get_tasks_by_tag(self, tag: str) -> List[Task]:
-        return [task for task in self.get_all_tasks() if tag in task.tags]
+        return self._tasks_at(
+            self._get_index()["by_tag"].get(tag, ()),
+            lambda task_data: tag in (task_data.get("tags") or ()))
 
     def get_overdue_tasks(self) -> List[Task]:
-        tasks = self.get_all_tasks()
+        due_ts = self._get_due_index()
         now = datetime.now()
-        return [
-            task for task in tasks
-            if task.due_date and task.status != Task.STATUS_COMPLETED and
-            datetime.fromisoformat(task.due_date.replace("Z", "+00:00")) < now
-        ]
+        return self._tasks_at(
+            np.flatnonzero(due_ts < now.timestamp()),
+            lambda task_data: self._due_between(task_data, None, now))
 
     def get_tasks_due_soon(self, days: int = 3) -> List[Task]:
-        tasks = self.get_all_tasks()
+        due_ts = self._get_due_index()
         now = datetime.now()
         soon = now + timedelta(days=days)
+        mask = (due_ts >= now.timestamp()) & (due_ts <= soon.timestamp())
+        return self._tasks_at(
+            np.flatnonzero(mask),
+            lambda task_data: self._due_between(task_data, now, soon))
+
+    @staticmethod
+    def _due_between(task_data: Dict[str, Any], start: Optional[datetime], end: datetime) -> bool:
+        """Check that an open task is due in [start, end], or before end when start is None."""
+        if not task_data.get("due_date") or \
+                task_data.get("status", Task.STATUS_PENDING) == Task.STATUS_COMPLETED:
+            return False
+        due = parse_iso(task_data["due_date"]).timestamp()
+        if start is None:
+            return due < end.timestamp()
+        return start.timestamp() <= due <= end.timestamp()
+
+    def _get_index(self) -> Dict[str, Any]:
+        """
+        Get the task lookup index, rebuilding it if the graph has changed.
+
+        Returns:
+            Dict of status, project and tag maps to positions in the task list
+        """
+        tasks = self.knowledge_graph.data.get("tasks", [])
+        version = (self.knowledge_graph.version, id(tasks))
+        if self._index is None or self._index_version != version:
+            by_status = defaultdict(list)
+            by_project = defaultdict(list)
+            by_tag = defaultdict(list)
+            for position, task_data in enumerate(tasks):
+                by_status[task_data.get("status", Task.STATUS_PENDING)].append(position)
+                by_project[task_data.get("project", "")].append(position)
+                for tag in dict.fromkeys(task_data.get("tags") or ()):
+                    by_tag[tag].append(position)
+
+            self._index = {
+                "tasks": tasks,
+                "by_status": dict(by_status),
+                "by_project": dict(by_project),
+                "by_tag": dict(by_tag),
+                # Built on first due-date query
+                "due": None,
+            }
+            self._index_version = version
+        return self._index
+
+    def _get_due_index(self) -> np.ndarray:
+        """
+        Get the due timestamp of every task, aligned with the task list.
+
+        Tasks without a due date and completed tasks hold +inf, so they are
+        never overdue or due soon.
+
+        Returns:
+            Array of due timestamps
+        """
+        index = self._get_index()
+        if index["due"] is None:
+            index["due"] = np.fromiter(
+                (
+                    parse_iso(task_data["due_date"]).timestamp()
+                    if task_data.get("due_date") and
+                    task_data.get("status", Task.STATUS_PENDING) != Task.STATUS_COMPLETED
+                    else np.inf
+                    for task_data in index["tasks"]
+                ),
+                dtype=np.float64,
+                count=len(index["tasks"])
+            )
+        return index["due"]
+
+    def _tasks_at(self, positions, matches) -> List[Task]:
+        """
+        Build task models for positions in the indexed task list.
+
+        Each hit is re-checked against the live task dict, so tasks edited in
+        place since the index was built are never reported by a stale entry.
+
+        Args:
+            positions: Candidate positions from the index
+            matches: Predicate the live task dict must still satisfy
+
+        Returns:
+            List of matching Task instances
+        """
+        tasks = self._index["tasks"]
         return [
-            task for task in tasks
-            if task.due_date and task.status != Task.STATUS_COMPLETED and
-            now <= datetime.fromisoformat(
-                task.due_date.replace("Z", "+00:00")) <= soon
+            Task.from_dict(tasks[position])
+            for position in positions
+            if position < len(tasks) and matches(tasks[position])
         ]
 
     def get_recurring_tasks(self) -> List[Task]:
@@ -242,23 +365,23 @@ class TaskService:
     def process_recurring_tasks(self) -> List[Task]:
         recurring_tasks = self.get_recurring_tasks()
         new_tasks = []
+        now = datetime.now()
 
         for task in recurring_tasks:
             if task.is_recurring and task.recurrence_enabled:
                 # Check if it's time to create a new instance
                 if task.recurrence_next_run:
-                    next_run = datetime.fromisoformat(
-                        task.recurrence_next_run.replace("Z", "+00:00"))
-                    if next_run <= datetime.now():
+                    next_run = parse_iso(task.recurrence_next_run)
+                    if next_run <= now:
                         # Create a new task instance
                         new_task_data = {
-                            "title": f"{task.title} ({datetime.now().strftime('%Y-%m-%d')})",
+                            "title": f"{task.title} ({now.strftime('%Y-%m-%d')})",
                             "description": task.description,
                             "status": Task.STATUS_PENDING,
                             "priority": task.priority,
                             "tags": task.tags + ["generated_from_recurring"],
                             "project": task.project,
-                            "due_date": (datetime.now() + timedelta(days=1)).isoformat(),
+                            "due_date": (now + timedelta(days=1)).isoformat(),
                             "calendar_sync": task.calendar_sync,
                             "calendar_provider": task.calendar_provider
                         }
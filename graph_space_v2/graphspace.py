@@ -10,6 +10,7 @@ from graph_space_v2.core.services.task_service import TaskService
 from graph_space_v2.core.services.query_service import QueryService
 from graph_space_v2.utils.config.config_loader import ConfigLoader
 from graph_space_v2.utils.helpers.path_utils import get_user_data_path, get_config_path
+from graph_space_v2.utils.helpers.migration_utils import run_all_migrations
 
 import os
 import json
@@ -61,6 +62,9 @@ class GraphSpace:
 
         # Initialize core components
         self.knowledge_graph = KnowledgeGraph(data_path=data_path)
+        # Import legacy tasks and notes kept alongside the data file
+        run_all_migrations(self.knowledge_graph,
+                           data_dir=os.path.dirname(os.path.abspath(data_path)))
         self.embedding_service = EmbeddingService(
             model_name=self.config["embedding"]["model"],
             dimension=self.config["embedding"]["dimension"]
@@ -78,7 +82,9 @@ class GraphSpace:
         self.task_service = TaskService(
             self.knowledge_graph, self.embedding_service, self.llm_service)
         self.query_service = QueryService(
-            self.knowledge_graph, self.embedding_service, self.llm_service)
+            self.knowledge_graph, self.embedding_service, self.llm_service,
+            semantic_cache_size=self.config["embedding"].get(
+                "semantic_cache_size", 0))
 
         # For backward compatibility with existing code
         self.core = type('CoreNamespace', (), {})()
@@ -97,7 +103,9 @@ class GraphSpace:
         self.document_processor = DocumentProcessor(
             llm_service=self.llm_service,
             embedding_service=self.embedding_service,
-            knowledge_graph=self.knowledge_graph
+            knowledge_graph=self.knowledge_graph,
+            embedding_quantization=self.config["embedding"].get(
+                "quantization", "none")
         )
 
         # Initialize AI components namespace
@@ -6,9 +6,11 @@ from datetime import datetime
 import traceback
 import json
 
+import numpy as np
+
 from graph_space_v2.integrations.document.extractors import ExtractorFactory, DocumentInfo
 from graph_space_v2.ai.llm.llm_service import LLMService
-from graph_space_v2.ai.embedding.embedding_service import EmbeddingService
+from graph_space_v2.ai.embedding.embedding_service import EmbeddingService, quantize_embeddings
 from graph_space_v2.utils.helpers.path_utils import ensure_dir_exists
 
 
@@ -20,13 +22,16 @@ class DocumentProcessor:
         knowledge_graph: Optional[Any] = None,
         max_workers: int = 4,
         chunk_size: int = 500,
-        storage_dir: Optional[str] = None
+        storage_dir: Optional[str] = None,
+        max_concurrent_llm_calls: int = 2,
+        embedding_quantization: str = "none"
     ):
         self.llm_service = llm_service
         self.embedding_service = embedding_service
         self.knowledge_graph = knowledge_graph
         self.max_workers = max_workers
         self.chunk_size = chunk_size
+        self.embedding_quantization = embedding_quantization
 
         # Use the storage directory from the path utils or fall back to default
         from graph_space_v2.utils.helpers.path_utils import get_data_dir
@@ -39,6 +44,10 @@ class DocumentProcessor:
         # Thread safety lock
         self.lock = threading.Lock()
 
+        # Cap concurrent LLM requests when files are processed in parallel
+        self.llm_semaphore = threading.BoundedSemaphore(
+            max(1, max_concurrent_llm_calls))
+
         # Metadata for processed files
         self.processed_files_metadata = {}
         self._load_metadata()
@@ -88,21 +97,24 @@ class DocumentProcessor:
             entities = {}
 
             if self.llm_service:
-                # Generate a summary
-                print(f"Calling LLM to generate_summary...")
-                summary = self.llm_service.generate_summary(doc_info.content)
-                print(f"Summary generated: {summary[:50]}...")
-
-                # Extract topics/tags
-                print(f"Calling LLM to extract_tags...")
-                topics = self.llm_service.extract_tags(doc_info.content)
-                print(f"Tags extracted: {topics}")
-
-                # Extract named entities
-                print(f"Calling LLM to extract_entities...")
-                entities = self.llm_service.extract_entities(doc_info.content)
-                print(
-                    f"Entities extracted: {list(entities.keys()) if entities else 'None'}")
+                with self.llm_semaphore:
+                    # Generate a summary
+                    print(f"Calling LLM to generate_summary...")
+                    summary = self.llm_service.generate_summary(
+                        doc_info.content)
+                    print(f"Summary generated: {summary[:50]}...")
+
+                    # Extract topics/tags
+                    print(f"Calling LLM to extract_tags...")
+                    topics = self.llm_service.extract_tags(doc_info.content)
+                    print(f"Tags extracted: {topics}")
+
+                    # Extract named entities
+                    print(f"Calling LLM to extract_entities...")
+                    entities = self.llm_service.extract_entities(
+                        doc_info.content)
+                    print(
+                        f"Entities extracted: {list(entities.keys()) if entities else 'None'}")
 
             # Convert topics to list if it's not already
             if not isinstance(topics, list):
@@ -126,28 +138,41 @@ class DocumentProcessor:
                 # Process content in chunks if it's too large
                 chunks = self._chunk_text(doc_info.content, self.chunk_size)
 
+                # Embed all chunks in a single batched call
+                embeddings = self.embedding_service.embed_texts(chunks)
+                vectors, scales = quantize_embeddings(
+                    np.asarray(embeddings, dtype=np.float32),
+                    self.embedding_quantization)
+
+                document_id = os.path.basename(file_path)
+                chunk_ids = []
+                chunk_metadatas = []
                 for i, chunk in enumerate(chunks):
-                    embedding = self.embedding_service.embed_text(chunk)
-                    chunk_id = f"{os.path.basename(file_path)}_chunk_{i}"
-
-                    # Store the embedding with metadata including tags
-                    self.embedding_service.store_embedding(
-                        chunk_id,
-                        embedding,
-                        {
-                            "type": "document_chunk",
-                            "document_id": os.path.basename(file_path),
-                            "chunk_index": i,
-                            "content": chunk,
-                            "title": doc_info.title,
-                            "tags": topics  # Include tags with chunk for better retrieval
-                        }
-                    )
+                    chunk_id = f"{document_id}_chunk_{i}"
+                    chunk_ids.append(chunk_id)
+                    chunk_metadata = {
+                        "type": "document_chunk",
+                        "document_id": document_id,
+                        "chunk_index": i,
+                        "content": chunk,
+                        "title": doc_info.title,
+                        "tags": topics  # Include tags with chunk for better retrieval
+                    }
+                    if self.embedding_quantization != "none":
+                        chunk_metadata["quantization"] = self.embedding_quantization
+                    if scales is not None:
+                        chunk_metadata["scale"] = float(scales[i, 0])
+                    chunk_metadatas.append(chunk_metadata)
 
                     chunk_embeddings.append({
                         "chunk_id": chunk_id,
                         "chunk_index": i
                     })
+
+                # Store all chunk embeddings with one index rebuild
+                self.embedding_service.store_embeddings_batch(
+                    chunk_ids, vectors, chunk_metadatas)
+
                 print(f"Created {len(chunks)} chunk embeddings for document")
 
             # Store processing results
@@ -186,14 +211,17 @@ class DocumentProcessor:
 
             # Add document to knowledge graph if available
             if self.knowledge_graph:
-                print(
-                    f"Adding document to knowledge graph: {result['id']} with tags: {topics}")
-                doc_id = self.knowledge_graph.add_document(result)
-                print(f"Document added to knowledge graph with ID: {doc_id}")
-
-                # Force graph rebuild to ensure connections are made
-                print("Rebuilding knowledge graph connections...")
-                self.knowledge_graph.build_graph()
+                # The knowledge graph is not thread-safe, so serialize writes
+                with self.lock:
+                    print(
+                        f"Adding document to knowledge graph: {result['id']} with tags: {topics}")
+                    doc_id = self.knowledge_graph.add_document(result)
+                    print(
+                        f"Document added to knowledge graph with ID: {doc_id}")
+
+                    # Force graph rebuild to ensure connections are made
+                    print("Rebuilding knowledge graph connections...")
+                    self.knowledge_graph.build_graph()
 
             return result
 
@@ -209,6 +237,43 @@ class DocumentProcessor:
                 "success": False
             }
 
+    def process_files(self, file_paths: List[str], metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Process several document files concurrently.
+
+        Args:
+            file_paths: Paths of the files to process
+            metadata: Optional metadata to associate with every document
+
+        Returns:
+            List of processing results in the same order as file_paths
+        """
+        if not file_paths:
+            return []
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_index = {
+                executor.submit(self.process_single_file, file_path, metadata): index
+                for index, file_path in enumerate(file_paths)
+            }
+
+            for future in concurrent.futures.as_completed(future_to_index):
+                index = future_to_index[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"Error processing file {file_paths[index]}: {e}")
+                    results[index] = {
+                        "file_path": file_paths[index],
+                        "error": str(e),
+                        "processed_at": datetime.now().isoformat(),
+                        "success": False
+                    }
+
+        return results
+
     def process_directory(self, directory_path: str) -> Dict[str, Any]:
         """
         Process all supported documents in a directory.
@@ -236,9 +301,7 @@ class DocumentProcessor:
             }
 
         # Process files in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            results = list(executor.map(
-                self.process_single_file, supported_files))
+        results = self.process_files(supported_files)
 
         return {
             "directory": directory_path,
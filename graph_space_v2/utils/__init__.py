@@ -23,7 +23,8 @@ from graph_space_v2.utils.helpers.file_utils import (
 from graph_space_v2.utils.helpers.migration_utils import (
     migrate_scheduled_tasks_to_unified_model,
     is_migration_needed,
-    migrate_legacy_notes
+    migrate_legacy_notes,
+    run_all_migrations
 )
 from graph_space_v2.utils.errors.exceptions import (
     GraphSpaceError,
@@ -68,6 +69,7 @@ __all__ = [
     'migrate_scheduled_tasks_to_unified_model',
     'is_migration_needed',
     'migrate_legacy_notes',
+    'run_all_migrations',
 
     # Exceptions
     'GraphSpaceError',
@@ -1,8 +1,11 @@
 import os
 import json
+import pickle
 import re
-from typing import Dict, Any
-from graph_space_v2.utils.helpers.path_utils import ensure_dir_exists, get_config_path, get_data_dir
+import threading
+from typing import Dict, Any, Optional, Tuple
+from graph_space_v2.utils.helpers.path_utils import get_config_path, get_data_dir
+from graph_space_v2.utils.helpers.file_utils import save_json
 
 
 class ConfigLoader:
@@ -17,6 +20,34 @@ class ConfigLoader:
         """
         self.config_path = config_path
 
+        # Template variables are fixed for the lifetime of the loader, so
+        # compile them into a single substitution pattern
+        self._template_map = {
+            "data_dir": get_data_dir(),
+            "config_dir": os.path.dirname(self.config_path)
+        }
+        self._template_re = re.compile(
+            r"\$\{(" + "|".join(map(re.escape, self._template_map)) + r")\}")
+
+        # Last loaded config, pickled so hits are cheap to copy, keyed by the
+        # file's inode, size and modification time
+        self._cached_config: Optional[bytes] = None
+        self._cached_key: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.RLock()
+
+    def _file_key(self) -> Optional[Tuple[int, int, int]]:
+        """Get the cache key for the config file, or None if it is missing."""
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _cache(self, config: Dict[str, Any], key: Optional[Tuple[int, int, int]]) -> None:
+        """Store a config snapshot under the given file key."""
+        self._cached_config = pickle.dumps(config, protocol=5)
+        self._cached_key = key
+
     def load_config(self) -> Dict[str, Any]:
         """
         Load configuration from a JSON file or create a default one.
@@ -24,38 +55,52 @@ class ConfigLoader:
         Returns:
             Dictionary containing the configuration
         """
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, "r") as f:
-                    config = json.load(f)
+        with self._lock:
+            key = self._file_key()
+
+            # Serve unchanged files, or previously generated defaults when
+            # the file could not be written, from the in-process cache
+            if self._cached_config is not None and key == self._cached_key:
+                return pickle.loads(self._cached_config)
+
+            if key is not None:
+                try:
+                    with open(self.config_path, "r") as f:
+                        config = json.load(f)
                     # Process any template variables in the config
-                    return self._process_template_vars(config)
-            except Exception as e:
-                print(f"Error loading config: {e}, using defaults")
-
-        # Default configuration
-        default_config = {
-            "embedding": {
-                "model": "sentence-transformers/all-mpnet-base-v2",
-                "dimension": 768
-            },
-            "llm": {
-                "api_enabled": True,
-                "model": "deepseek-chat",
-                "fallback_model": "meta-llama/Llama-3-8B-Instruct"
-            },
-            "document_processing": {
-                "max_workers": 4,
-                "chunk_size": 1000
+                    config = self._process_template_vars(config)
+                    self._cache(config, key)
+                    return config
+                except Exception as e:
+                    print(f"Error loading config: {e}, using defaults")
+
+            # Default configuration
+            default_config = {
+                "embedding": {
+                    "model": "sentence-transformers/all-mpnet-base-v2",
+                    "dimension": 768
+                },
+                "llm": {
+                    "api_enabled": True,
+                    "model": "deepseek-chat",
+                    "fallback_model": "meta-llama/Llama-3-8B-Instruct"
+                },
+                "document_processing": {
+                    "max_workers": 4,
+                    "chunk_size": 1000
+                }
             }
-        }
 
-        # Save default config
-        ensure_dir_exists(os.path.dirname(self.config_path))
-        with open(self.config_path, "w") as f:
-            json.dump(default_config, f, indent=2)
+            # Save default config once; later calls hit the cache
+            try:
+                save_json(default_config, self.config_path)
+                key = self._file_key()
+            except OSError as e:
+                print(f"Error saving default config: {e}")
+                key = None
 
-        return default_config
+            self._cache(default_config, key)
+            return default_config
 
     def _process_template_vars(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -67,20 +112,19 @@ class ConfigLoader:
         Returns:
             Processed configuration with template variables replaced
         """
-        # Convert to JSON and back to easily find and replace all string values
-        config_str = json.dumps(config)
-
-        # Replace variables
-        var_map = {
-            "${data_dir}": get_data_dir(),
-            "${config_dir}": os.path.dirname(self.config_path)
-        }
-
-        for var, value in var_map.items():
-            config_str = config_str.replace(var, value.replace("\\", "\\\\"))
-
-        # Convert back to dict
-        return json.loads(config_str)
+        def _walk(node: Any) -> Any:
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    node[key] = _walk(value)
+            elif isinstance(node, list):
+                for index, value in enumerate(node):
+                    node[index] = _walk(value)
+            elif isinstance(node, str) and "${" in node:
+                node = self._template_re.sub(
+                    lambda m: self._template_map[m.group(1)], node)
+            return node
+
+        return _walk(config)
 
     def save_config(self, config: Dict[str, Any]) -> None:
         """
@@ -89,9 +133,12 @@ class ConfigLoader:
         Args:
             config: Configuration dictionary to save
         """
-        ensure_dir_exists(os.path.dirname(self.config_path))
-        with open(self.config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        with self._lock:
+            save_json(config, self.config_path)
+            # Cache what a reload would produce, without re-reading the file
+            self._cache(
+                self._process_template_vars(pickle.loads(pickle.dumps(config, protocol=5))),
+                self._file_key())
 
     def update_config(self, updates: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -103,16 +150,23 @@ class ConfigLoader:
         Returns:
             Updated configuration dictionary
         """
-        config = self.load_config()
-
-        # Deep update the configuration
-        def update_nested_dict(d, u):
-            for k, v in u.items():
-                if isinstance(v, dict) and k in d and isinstance(d[k], dict):
-                    update_nested_dict(d[k], v)
-                else:
-                    d[k] = v
-
-        update_nested_dict(config, updates)
-        self.save_config(config)
-        return config
+        with self._lock:
+            config = self.load_config()
+
+            # Deep update the configuration, tracking whether anything changed
+            def update_nested_dict(d, u) -> bool:
+                dirty = False
+                stack = [(d, u)]
+                while stack:
+                    target, changes = stack.pop()
+                    for k, v in changes.items():
+                        if isinstance(v, dict) and isinstance(target.get(k), dict):
+                            stack.append((target[k], v))
+                        elif k not in target or target[k] != v:
+                            target[k] = v
+                            dirty = True
+                return dirty
+
+            if update_nested_dict(config, updates):
+                self.save_config(config)
+            return config
@@ -1,4 +1,5 @@
 import os
+import pickle
 from graph_space_v2.utils.helpers.path_utils import get_data_dir
 from typing import Dict, Any
 
@@ -26,7 +27,9 @@ DEFAULT_CONFIG = {
     "embedding": {
         "model": "sentence-transformers/all-mpnet-base-v2",
         "dimension": 768,
-        "batch_size": 32
+        "batch_size": 32,
+        "quantization": "none",
+        "semantic_cache_size": 0
     },
     "llm": {
         "api_enabled": True,
@@ -66,11 +69,35 @@ DEFAULT_CONFIG = {
 }
 
 
+# Frozen copies of the defaults; unpickling is a cheap deep copy
+_FROZEN_DEFAULTS = pickle.dumps(DEFAULT_CONFIG, protocol=5)
+_FROZEN_SECTIONS = {
+    section: pickle.dumps(values, protocol=5)
+    for section, values in DEFAULT_CONFIG.items()
+}
+
+
 def get_default_config() -> Dict[str, Any]:
-    return DEFAULT_CONFIG.copy()
+    """
+    Get a fresh copy of the default configuration.
+
+    Returns:
+        Independent deep copy of the defaults, safe to mutate
+    """
+    return pickle.loads(_FROZEN_DEFAULTS)
 
 
 def get_section_defaults(section: str) -> Dict[str, Any]:
-    if section in DEFAULT_CONFIG:
-        return DEFAULT_CONFIG[section].copy()
+    """
+    Get a fresh copy of the defaults for a single section.
+
+    Args:
+        section: Name of the configuration section
+
+    Returns:
+        Independent deep copy of the section defaults, safe to mutate,
+        or an empty dict for unknown sections
+    """
+    if section in _FROZEN_SECTIONS:
+        return pickle.loads(_FROZEN_SECTIONS[section])
     return {}
@@ -1,58 +1,58 @@
 class GraphSpaceError(Exception):
     """Base exception for all GraphSpace errors."""
-    pass
+    __slots__ = ()
 
 
 class ConfigError(GraphSpaceError):
     """Raised when there is an error with configuration."""
-    pass
+    __slots__ = ()
 
 
 class KnowledgeGraphError(GraphSpaceError):
     """Raised when there is an error with the knowledge graph."""
-    pass
+    __slots__ = ()
 
 
 class ModelError(GraphSpaceError):
     """Raised when there is an error with a model."""
-    pass
+    __slots__ = ()
 
 
 class ServiceError(GraphSpaceError):
     """Raised when there is an error with a service."""
-    pass
+    __slots__ = ()
 
 
 class EntityNotFoundError(GraphSpaceError):
     """Raised when an entity is not found."""
-    pass
+    __slots__ = ()
 
 
 class AuthenticationError(GraphSpaceError):
     """Raised when there is an authentication error."""
-    pass
+    __slots__ = ()
 
 
 class DocumentProcessingError(GraphSpaceError):
     """Raised when there is an error processing a document."""
-    pass
+    __slots__ = ()
 
 
 class APIError(GraphSpaceError):
     """Raised when there is an error with an API."""
-    pass
+    __slots__ = ()
 
 
 class EmbeddingError(GraphSpaceError):
     """Raised when there is an error with an embedding."""
-    pass
+    __slots__ = ()
 
 
 class LLMError(GraphSpaceError):
     """Raised when there is an error with a language model."""
-    pass
+    __slots__ = ()
 
 
 class IntegrationError(GraphSpaceError):
     """Raised when there is an error with an external integration."""
-    pass
+    __slots__ = ()
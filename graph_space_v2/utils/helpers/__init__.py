@@ -23,7 +23,8 @@ from graph_space_v2.utils.helpers.file_utils import (
 from graph_space_v2.utils.helpers.migration_utils import (
     migrate_scheduled_tasks_to_unified_model,
     is_migration_needed,
-    migrate_legacy_notes
+    migrate_legacy_notes,
+    run_all_migrations
 )
 
 __all__ = [
@@ -50,5 +51,6 @@ __all__ = [
     # Migration utilities
     'migrate_scheduled_tasks_to_unified_model',
     'is_migration_needed',
-    'migrate_legacy_notes'
+    'migrate_legacy_notes',
+    'run_all_migrations'
 ]
@@ -2,9 +2,60 @@ from datetime import datetime, timedelta
 from typing import Optional, Union, Dict, Any, Tuple
 import pytz
 import re
+from bisect import bisect_right
+from functools import lru_cache
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso_c
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
 
 DateType = Union[str, datetime]
 
+# Days per month in a non-leap year (February is adjusted for leap years)
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Non-ISO date shapes accepted by parse_date, in priority order. Each shape
+# lists candidate parsers tried in turn: a tuple names the datetime fields
+# held by the regex groups, a string is a strptime format.
+_YMD = ("year", "month", "day")
+_DMY = ("day", "month", "year")
+_MDY = ("month", "day", "year")
+_DATE_SHAPES = [
+    (re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$", re.ASCII), (_YMD,)),
+    (re.compile(r"^(\d{4})/(\d{1,2})/(\d{1,2})$", re.ASCII), (_YMD,)),
+    (re.compile(r"^(\d{1,2})-(\d{1,2})-(\d{4})$", re.ASCII), (_DMY, _MDY)),
+    (re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$", re.ASCII), (_DMY, _MDY)),
+    (re.compile(r"^[A-Za-z]+ \d{1,2}, \d{4}$", re.ASCII), ("%b %d, %Y", "%B %d, %Y")),
+    (re.compile(r"^\d{1,2} [A-Za-z]+ \d{4}$", re.ASCII), ("%d %b %Y", "%d %B %Y")),
+    (re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2}):(\d{1,2})$", re.ASCII),
+     (_YMD + ("hour", "minute", "second"),)),
+    (re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2})$", re.ASCII),
+     (_YMD + ("hour", "minute"),)),
+    (re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4}) (\d{1,2}):(\d{1,2}):(\d{1,2})$", re.ASCII),
+     (_DMY + ("hour", "minute", "second"),)),
+    (re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4}) (\d{1,2}):(\d{1,2})$", re.ASCII),
+     (_DMY + ("hour", "minute"),)),
+]
+
+# time_ago buckets: (upper bound in seconds, divisor, unit name)
+_TIME_BUCKETS = (
+    (60, 1, None),  # just now
+    (3600, 60, "minute"),
+    (86400, 3600, "hour"),
+    (2592000, 86400, "day"),  # 30 days
+    (31536000, 2592000, "month"),  # 365 days
+    (float("inf"), 31536000, "year"),
+)
+_TIME_THRESHOLDS = tuple(bucket[0] for bucket in _TIME_BUCKETS)
+
+
+@lru_cache(maxsize=1024)
+def _strptime(date_str: str, fmt: str) -> datetime:
+    """Cached datetime.strptime for repeated textual dates."""
+    return datetime.strptime(date_str, fmt)
+
 
 def parse_date(date_str: str) -> Optional[datetime]:
     """
@@ -20,35 +71,33 @@ def parse_date(date_str: str) -> Optional[datetime]:
     if not date_str:
         return None
 
+    # Try ISO format first (most common)
+    if CISO8601_AVAILABLE:
+        try:
+            return _parse_iso_c(date_str)
+        except ValueError:
+            pass
+
     try:
-        # Try ISO format first (most common)
-        return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        if date_str.endswith("Z"):
+            date_str = date_str[:-1] + "+00:00"
+        return datetime.fromisoformat(date_str)
     except ValueError:
         pass
 
-    # Try common date formats
-    formats = [
-        "%Y-%m-%d",
-        "%Y/%m/%d",
-        "%d-%m-%Y",
-        "%d/%m/%Y",
-        "%m-%d-%Y",
-        "%m/%d/%Y",
-        "%b %d, %Y",
-        "%d %b %Y",
-        "%B %d, %Y",
-        "%d %B %Y",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%d/%m/%Y %H:%M:%S",
-        "%d/%m/%Y %H:%M"
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
+    # Dispatch on the string's shape instead of trying every format
+    for pattern, candidates in _DATE_SHAPES:
+        match = pattern.match(date_str)
+        if not match:
             continue
+        for candidate in candidates:
+            try:
+                if isinstance(candidate, str):
+                    return _strptime(date_str, candidate)
+                return datetime(**dict(zip(candidate, map(int, match.groups()))))
+            except ValueError:
+                continue
+        return None
 
     return None
 
@@ -64,6 +113,10 @@ def format_date(date_obj: DateType, format_str: str = "%Y-%m-%d") -> str:
     Returns:
         Formatted date string
     """
+    # Most callers already pass a datetime
+    if type(date_obj) is datetime:
+        return date_obj.strftime(format_str)
+
     if isinstance(date_obj, str):
         date = parse_date(date_obj)
         if not date:
@@ -84,6 +137,10 @@ def to_iso_format(date_obj: DateType) -> str:
     Returns:
         ISO formatted date string
     """
+    # Most callers already pass a datetime
+    if type(date_obj) is datetime:
+        return date_obj.isoformat()
+
     if isinstance(date_obj, str):
         date = parse_date(date_obj)
         if not date:
@@ -129,11 +186,13 @@ def calculate_next_occurrence(start_date: DateType, frequency: str,
     elif frequency == "weekly":
         next_date = base_date + timedelta(weeks=1)
     elif frequency == "monthly":
-        # Add a month (approximately)
-        year = base_date.year + ((base_date.month + 1) // 12)
-        month = ((base_date.month + 1) % 12) or 12
-        day = min(base_date.day, [31, 29 if is_leap_year(
-            year) else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31][month-1])
+        # Add a month, clamping the day to the length of the target month
+        year = base_date.year + base_date.month // 12
+        month = base_date.month % 12 + 1
+        days_in_month = _DAYS_IN_MONTH[month - 1]
+        if month == 2 and is_leap_year(year):
+            days_in_month = 29
+        day = min(base_date.day, days_in_month)
         next_date = base_date.replace(year=year, month=month, day=day)
     else:
         next_date = base_date + timedelta(days=1)  # Default to daily
@@ -175,20 +234,9 @@ def time_ago(date: DateType) -> str:
 
     seconds = diff.total_seconds()
 
-    if seconds < 60:
+    _, divisor, unit = _TIME_BUCKETS[bisect_right(_TIME_THRESHOLDS, seconds)]
+    if unit is None:
         return "just now"
-    elif seconds < 3600:
-        minutes = int(seconds // 60)
-        return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
-    elif seconds < 86400:
-        hours = int(seconds // 3600)
-        return f"{hours} hour{'s' if hours > 1 else ''} ago"
-    elif seconds < 2592000:  # 30 days
-        days = int(seconds // 86400)
-        return f"{days} day{'s' if days > 1 else ''} ago"
-    elif seconds < 31536000:  # 365 days
-        months = int(seconds // 2592000)
-        return f"{months} month{'s' if months > 1 else ''} ago"
-    else:
-        years = int(seconds // 31536000)
-        return f"{years} year{'s' if years > 1 else ''} ago"
+
+    count = int(seconds // divisor)
+    return f"{count} {unit}{'s' if count > 1 else ''} ago"
@@ -1,12 +1,57 @@
 import os
+import atexit
+import errno
+import itertools
 import json
 import shutil
 import tempfile
-from typing import Dict, List, Any, Optional, Union, BinaryIO
+import threading
+from typing import Dict, List, Any, Optional, Union, BinaryIO, Iterable, FrozenSet
+from functools import lru_cache
 from pathlib import Path
 import hashlib
 import mimetypes
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Load the MIME tables up front rather than on the first lookup
+mimetypes.init()
+
+# Per-process directory for create_temp_file, created on first use
+_session_temp_dir: Optional[str] = None
+_session_temp_lock = threading.Lock()
+_temp_counter = itertools.count()
+
+# Read block used when hashing files
+HASH_BLOCK_SIZE = 1 << 20
+
+# Bytes requested per in-kernel copy_file_range call
+COPY_CHUNK_SIZE = 1 << 26
+
+_O_CLOEXEC = getattr(os, 'O_CLOEXEC', 0)
+
+# copy_file_range errors that mean "not supported here", not a failed copy
+_COPY_RANGE_UNSUPPORTED = {
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP,
+    getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP)
+}
+
 
 def ensure_dir(directory: str) -> None:
     """
@@ -31,18 +76,31 @@ def get_file_extension(filename: str) -> str:
     return os.path.splitext(filename)[1].lower().lstrip('.')
 
 
-def is_allowed_file(filename: str, allowed_extensions: List[str]) -> bool:
+@lru_cache(maxsize=16)
+def _extension_set(extensions: tuple) -> FrozenSet[str]:
+    """Normalize a tuple of extensions into a frozenset for O(1) lookups."""
+    return frozenset(ext.lower().lstrip('.') for ext in extensions)
+
+
+def is_allowed_file(filename: str, allowed_extensions: Iterable[str]) -> bool:
     """
     Check if a file has an allowed extension.
 
     Args:
         filename: Filename to check
-        allowed_extensions: List of allowed extensions
+        allowed_extensions: Allowed extensions, with or without a leading dot
 
     Returns:
         True if the file has an allowed extension, False otherwise
     """
-    return get_file_extension(filename) in allowed_extensions
+    return get_file_extension(filename) in _extension_set(tuple(allowed_extensions))
+
+
+@lru_cache(maxsize=64)
+def _mime_by_ext(ext: str) -> str:
+    """Look up the MIME type for a bare file extension."""
+    mime_type, _ = mimetypes.guess_type("f." + ext)
+    return mime_type or 'application/octet-stream'
 
 
 def get_mime_type(filename: str) -> str:
@@ -55,21 +113,57 @@ def get_mime_type(filename: str) -> str:
     Returns:
         MIME type
     """
-    mime_type, _ = mimetypes.guess_type(filename)
-    return mime_type or 'application/octet-stream'
+    ext = get_file_extension(filename)
+    if '.' + ext in mimetypes.encodings_map:
+        # Compressed files (.tar.gz) take their type from the inner suffix
+        mime_type, _ = mimetypes.guess_type(filename)
+        return mime_type or 'application/octet-stream'
+    return _mime_by_ext(ext)
 
 
 def save_json(data: Any, filepath: str) -> None:
     """
     Save data to a JSON file.
 
+    The data is written to a uniquely named temporary file next to the
+    target and moved into place with os.replace, so readers never see a
+    partial file and concurrent writers don't share a temporary file. Uses
+    orjson when it is installed.
+
     Args:
         data: Data to save
         filepath: Path to save to
     """
-    ensure_dir(os.path.dirname(filepath))
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    directory = os.path.dirname(filepath)
+    ensure_dir(directory or ".")
+
+    payload = None
+    if ORJSON_AVAILABLE:
+        try:
+            payload = orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Fall back to the stdlib for types orjson cannot encode
+            payload = None
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory or ".", prefix=os.path.basename(filepath) + ".", suffix=".tmp")
+    try:
+        if payload is not None:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        # Don't leave the partial temporary file behind
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 def load_json(filepath: str, default: Any = None) -> Any:
@@ -83,34 +177,62 @@ def load_json(filepath: str, default: Any = None) -> Any:
     Returns:
         Loaded data or default value
     """
-    if not os.path.exists(filepath):
-        return default
-
     try:
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'rb') as f:
+                return orjson.loads(f.read())
         with open(filepath, 'r', encoding='utf-8') as f:
             return json.load(f)
+    except FileNotFoundError:
+        return default
     except (json.JSONDecodeError, IOError):
         return default
 
 
+def _new_hasher(algorithm: str):
+    """Create a hasher, raising if an optional backend is not installed."""
+    if algorithm == 'blake3':
+        if not BLAKE3_AVAILABLE:
+            raise ImportError(
+                "The 'blake3' hash algorithm requires the blake3 package")
+        return blake3.blake3()
+    if algorithm == 'xxh3':
+        if not XXHASH_AVAILABLE:
+            raise ImportError(
+                "The 'xxh3' hash algorithm requires the xxhash package")
+        return xxhash.xxh3_64()
+    return hashlib.new(algorithm)
+
+
 def file_hash(filepath: str, algorithm: str = 'md5') -> str:
     """
     Calculate the hash of a file.
 
+    Besides any hashlib name, 'blake3' and 'xxh3' are supported when their
+    optional packages are installed.
+
     Args:
         filepath: Path to the file
-        algorithm: Hash algorithm to use
+        algorithm: Hash algorithm to use ('md5', 'sha256', 'blake3', 'xxh3', ...)
 
     Returns:
         Hexadecimal hash string
+
+    Raises:
+        ImportError: If the package for 'blake3' or 'xxh3' is not installed
     """
-    if not os.path.exists(filepath):
+    hasher = _new_hasher(algorithm)
+    buffer = bytearray(HASH_BLOCK_SIZE)
+    view = memoryview(buffer)
+    try:
+        with open(filepath, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hasher.update(view[:n])
+    except FileNotFoundError:
         return ""
-
-    hasher = hashlib.new(algorithm)
-    with open(filepath, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hasher.update(chunk)
     return hasher.hexdigest()
 
 
@@ -125,11 +247,11 @@ def get_file_size(filepath: str, format: str = 'bytes') -> Union[int, str]:
     Returns:
         File size in the specified format
     """
-    if not os.path.exists(filepath):
+    try:
+        size_bytes = os.path.getsize(filepath)
+    except FileNotFoundError:
         return 0
 
-    size_bytes = os.path.getsize(filepath)
-
     if format == 'bytes':
         return size_bytes
     elif format == 'kb':
@@ -142,10 +264,25 @@ def get_file_size(filepath: str, format: str = 'bytes') -> Union[int, str]:
         return size_bytes
 
 
+def _get_session_temp_dir() -> str:
+    """Create the per-process temp directory once and remove it at exit."""
+    global _session_temp_dir
+    if _session_temp_dir is None:
+        with _session_temp_lock:
+            if _session_temp_dir is None:
+                path = tempfile.mkdtemp(prefix='gs_')
+                atexit.register(shutil.rmtree, path, ignore_errors=True)
+                _session_temp_dir = path
+    return _session_temp_dir
+
+
 def create_temp_file(data: Union[str, bytes], suffix: Optional[str] = None) -> str:
     """
     Create a temporary file with the given content.
 
+    Files are numbered sequentially inside a per-process temp directory,
+    which is removed when the interpreter exits.
+
     Args:
         data: Data to write to the file
         suffix: Optional file suffix
@@ -153,12 +290,15 @@ def create_temp_file(data: Union[str, bytes], suffix: Optional[str] = None) -> s
     Returns:
         Path to the temporary file
     """
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp:
+    name = os.path.join(_get_session_temp_dir(),
+                        f"t{next(_temp_counter)}{suffix or ''}")
+    fd = os.open(name, os.O_CREAT | os.O_EXCL | os.O_WRONLY | _O_CLOEXEC, 0o600)
+    with os.fdopen(fd, 'wb') as temp:
         if isinstance(data, str):
             temp.write(data.encode('utf-8'))
         else:
             temp.write(data)
-        return temp.name
+    return name
 
 
 def delete_file(filepath: str) -> bool:
@@ -171,23 +311,68 @@ def delete_file(filepath: str) -> bool:
     Returns:
         True if file was deleted, False otherwise
     """
-    if os.path.exists(filepath):
-        try:
-            os.remove(filepath)
-            return True
-        except OSError:
-            return False
-    return False
+    try:
+        os.remove(filepath)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return False
 
 
-def copy_file(src: str, dst: str, overwrite: bool = True) -> bool:
+def _copy_file_range(src: str, dst: str) -> bool:
+    """
+    Copy file contents in-kernel with os.copy_file_range.
+
+    Args:
+        src: Source path
+        dst: Destination path
+
+    Returns:
+        True if the contents were copied, False if the fast path is not
+        supported and the caller should fall back
+    """
+    if not hasattr(os, 'copy_file_range'):
+        return False
+
+    src_fd = os.open(src, os.O_RDONLY | _O_CLOEXEC)
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_CLOEXEC, 0o666)
+        try:
+            copied = 0
+            while True:
+                try:
+                    n = os.copy_file_range(src_fd, dst_fd, COPY_CHUNK_SIZE)
+                except OSError as e:
+                    if copied == 0 and e.errno in _COPY_RANGE_UNSUPPORTED:
+                        return False
+                    raise
+                if n == 0:
+                    break
+                copied += n
+            # Some filesystems report EOF straight away instead of failing
+            return copied > 0 or size == 0
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def copy_file(src: str, dst: str, overwrite: bool = True,
+              preserve_meta: bool = False) -> bool:
     """
     Copy a file from source to destination.
 
+    Contents are copied in-kernel where the platform allows it. Access and
+    modification times are always preserved; permission bits, flags and
+    extended attributes only when preserve_meta is set.
+
     Args:
         src: Source path
         dst: Destination path
         overwrite: Whether to overwrite existing files
+        preserve_meta: Whether to copy all file metadata like shutil.copy2
 
     Returns:
         True if file was copied, False otherwise
@@ -200,7 +385,15 @@ def copy_file(src: str, dst: str, overwrite: bool = True) -> bool:
 
     try:
         ensure_dir(os.path.dirname(dst))
-        shutil.copy2(src, dst)
+        if not _copy_file_range(src, dst):
+            # shutil uses sendfile/fcopyfile where available
+            shutil.copyfile(src, dst)
+
+        if preserve_meta:
+            shutil.copystat(src, dst)
+        else:
+            st = os.stat(src)
+            os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
         return True
     except OSError:
         return False
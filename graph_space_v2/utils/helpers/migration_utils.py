@@ -1,43 +1,93 @@
 import os
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 from datetime import datetime
-from pathlib import Path
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+from graph_space_v2.utils.helpers.path_utils import get_data_dir, get_data_file_path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fields shared by every migrated task and note
+_STATIC_TASK_FIELDS = {'status': 'pending', 'is_recurring': True}
+_STATIC_NOTE_FIELDS = {'type': 'note'}
+
+# Default locations of the legacy data files, resolved once
+_DATA_DIR = get_data_dir()
+_SCHEDULED_TASKS_PATH = get_data_file_path("scheduled_tasks.json")
+_LEGACY_NOTES_PATH = get_data_file_path("notes.json")
+
+
+def _iter_json_array(file_path: str) -> Iterator[Any]:
+    """
+    Yield the items of a JSON file holding a top-level array.
+
+    Items are streamed one at a time with ijson when it is installed, so
+    large legacy files are never fully materialized in memory.
+
+    Args:
+        file_path: Path to the JSON file
+
+    Returns:
+        Iterator over the array items
+    """
+    with open(file_path, 'rb') as f:
+        if IJSON_AVAILABLE:
+            yield from ijson.items(f, 'item', use_float=True)
+        else:
+            yield from json.load(f)
+
+
+def _backup_source(file_path: str, label: str) -> None:
+    """Rename a migrated source file to .bak so it is not migrated again."""
+    backup_path = file_path + ".bak"
+    try:
+        os.rename(file_path, backup_path)
+        logger.info(f"Renamed old {label} file to {backup_path}")
+    except Exception as e:
+        logger.warning(f"Could not rename old {label} file: {e}")
+
 
-def migrate_scheduled_tasks_to_unified_model(knowledge_graph, task_scheduler=None):
+def migrate_scheduled_tasks_to_unified_model(knowledge_graph, task_scheduler=None,
+                                             scheduled_tasks_path=None, defer_backup=False):
     """
     Migrate existing scheduled tasks to the new unified task model.
 
     Args:
         knowledge_graph: The knowledge graph instance
         task_scheduler: Optional task scheduler instance
+        scheduled_tasks_path: Optional path to the scheduled tasks file
+        defer_backup: If True, don't rename the source file; instead return its
+            path as "source_path" so the caller can rename it once the data is saved
 
     Returns:
         Dict containing migration statistics
     """
     if task_scheduler is None:
         # Load tasks from the default scheduled tasks file
-        base_dir = os.path.dirname(os.path.dirname(
-            os.path.dirname(os.path.abspath(__file__))))
-        scheduled_tasks_path = os.path.join(
-            base_dir, "data", "scheduled_tasks.json")
+        if scheduled_tasks_path is None:
+            scheduled_tasks_path = _SCHEDULED_TASKS_PATH
 
-        if not os.path.exists(scheduled_tasks_path):
+        # One stat covers both the missing and the empty file
+        try:
+            file_size = os.stat(scheduled_tasks_path).st_size
+        except OSError:
             logger.info("No scheduled tasks file found, nothing to migrate")
             return {"success": True, "migrated": 0}
 
-        try:
-            with open(scheduled_tasks_path, 'r') as f:
-                scheduled_tasks = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading scheduled tasks: {e}")
-            return {"success": False, "error": str(e)}
+        if file_size == 0:
+            logger.info("Scheduled tasks file is empty, nothing to migrate")
+            return {"success": True, "migrated": 0}
+
+        scheduled_tasks = _iter_json_array(scheduled_tasks_path)
     else:
         # Use the task scheduler's loaded tasks
         scheduled_tasks = task_scheduler.get_tasks()
@@ -45,60 +95,70 @@ def migrate_scheduled_tasks_to_unified_model(knowledge_graph, task_scheduler=Non
     # Statistics
     stats = {
         "success": True,
-        "total": len(scheduled_tasks),
+        "total": 0,
         "migrated": 0,
         "errors": 0
     }
 
-    # Process each scheduled task
-    for scheduled_task in scheduled_tasks:
-        try:
-            # Create a unified task model entry
-            task_data = {
-                'title': scheduled_task.get('title', 'Unnamed Task'),
-                'description': scheduled_task.get('description', ''),
-                'status': 'pending',
-                'project': scheduled_task.get('project', ''),
-                'tags': scheduled_task.get('tags', []) + ['recurring', 'migrated'],
-                'created_at': scheduled_task.get('start_date', datetime.now().isoformat()),
-                'updated_at': datetime.now().isoformat(),
-
-                # Add recurrence fields
-                'is_recurring': True,
-                'recurrence_frequency': scheduled_task.get('frequency', 'daily'),
-                'recurrence_start_date': scheduled_task.get('start_date', datetime.now().isoformat()),
-                'recurrence_last_run': scheduled_task.get('last_run'),
-                'recurrence_next_run': scheduled_task.get('next_run', datetime.now().isoformat()),
-                'recurrence_enabled': scheduled_task.get('enabled', True)
-            }
-
-            # Add to knowledge graph
-            knowledge_graph.data.setdefault("tasks", []).append(task_data)
-            stats["migrated"] += 1
+    # Process each scheduled task as it is read; all migrated entries share
+    # one timestamp
+    now_iso = datetime.now().isoformat()
+    migrated_tasks = []
+    total = migrated = errors = 0
+    try:
+        for scheduled_task in scheduled_tasks:
+            total += 1
+            try:
+                # Create a unified task model entry
+                task_data = {
+                    **_STATIC_TASK_FIELDS,
+                    'title': scheduled_task.get('title', 'Unnamed Task'),
+                    'description': scheduled_task.get('description', ''),
+                    'project': scheduled_task.get('project', ''),
+                    'tags': [*scheduled_task.get('tags', ()), 'recurring', 'migrated'],
+                    'created_at': scheduled_task.get('start_date', now_iso),
+                    'updated_at': now_iso,
 
-        except Exception as e:
-            logger.error(f"Error migrating scheduled task: {e}")
-            stats["errors"] += 1
+                    # Add recurrence fields
+                    'recurrence_frequency': scheduled_task.get('frequency', 'daily'),
+                    'recurrence_start_date': scheduled_task.get('start_date', now_iso),
+                    'recurrence_last_run': scheduled_task.get('last_run'),
+                    'recurrence_next_run': scheduled_task.get('next_run', now_iso),
+                    'recurrence_enabled': scheduled_task.get('enabled', True)
+                }
+
+                migrated_tasks.append(task_data)
+                migrated += 1
+
+            except Exception as e:
+                logger.error(f"Error migrating scheduled task: {e}")
+                errors += 1
+    except Exception as e:
+        logger.error(f"Error loading scheduled tasks: {e}")
+        return {"success": False, "error": str(e)}
+
+    stats["total"] = total
+    stats["migrated"] = migrated
+    stats["errors"] = errors
+
+    # Add to knowledge graph in one step
+    knowledge_graph.data.setdefault("tasks", []).extend(migrated_tasks)
 
     # Save the updated knowledge graph
     if stats["migrated"] > 0:
         try:
-            # Rebuild the graph
-            knowledge_graph.build_graph()
+            # Defer the graph rebuild until it is next needed
+            knowledge_graph.mark_dirty()
 
             # Save the data
             knowledge_graph.save_data()
 
             # If migration was successful, rename the old scheduled tasks file
             if task_scheduler is None and stats["errors"] == 0:
-                backup_path = scheduled_tasks_path + ".bak"
-                try:
-                    Path(scheduled_tasks_path).rename(backup_path)
-                    logger.info(
-                        f"Renamed old scheduled tasks file to {backup_path}")
-                except Exception as e:
-                    logger.warning(
-                        f"Could not rename old scheduled tasks file: {e}")
+                if defer_backup:
+                    stats["source_path"] = scheduled_tasks_path
+                else:
+                    _backup_source(scheduled_tasks_path, "scheduled tasks")
         except Exception as e:
             logger.error(f"Error saving knowledge graph after migration: {e}")
             stats["success"] = False
@@ -109,85 +169,147 @@ def migrate_scheduled_tasks_to_unified_model(knowledge_graph, task_scheduler=Non
     return stats
 
 
-def is_migration_needed():
+def is_migration_needed(data_dir=None):
     """
     Check if migration is needed by looking for the scheduled tasks file.
 
+    Args:
+        data_dir: Optional directory to check instead of the default data directory
+
     Returns:
         bool: True if migration is needed, False otherwise
     """
-    base_dir = os.path.dirname(os.path.dirname(
-        os.path.dirname(os.path.abspath(__file__))))
-    scheduled_tasks_path = os.path.join(
-        base_dir, "data", "scheduled_tasks.json")
-    backup_path = scheduled_tasks_path + ".bak"
+    # List the data directory once instead of stat-ing each file
+    try:
+        with os.scandir(data_dir or _DATA_DIR) as entries:
+            names = {entry.name for entry in entries}
+    except FileNotFoundError:
+        return False
 
     # If original file exists and .bak doesn't, we need migration
-    return os.path.exists(scheduled_tasks_path) and not os.path.exists(backup_path)
+    return "scheduled_tasks.json" in names and "scheduled_tasks.json.bak" not in names
 
 
-def migrate_legacy_notes(knowledge_graph, notes_file_path=None):
+def migrate_legacy_notes(knowledge_graph, notes_file_path=None, defer_backup=False):
     """
     Migrate notes from a legacy format to the new knowledge graph format.
 
     Args:
         knowledge_graph: The knowledge graph instance
         notes_file_path: Optional path to the legacy notes file
+        defer_backup: If True, don't rename the source file; instead return its
+            path as "source_path" so the caller can rename it once the data is saved
 
     Returns:
         Dict containing migration statistics
     """
     if notes_file_path is None:
-        base_dir = os.path.dirname(os.path.dirname(
-            os.path.dirname(os.path.abspath(__file__))))
-        notes_file_path = os.path.join(base_dir, "data", "notes.json")
+        notes_file_path = _LEGACY_NOTES_PATH
 
-    if not os.path.exists(notes_file_path):
+    # One stat covers both the missing and the empty file
+    try:
+        file_size = os.stat(notes_file_path).st_size
+    except OSError:
         logger.info("No legacy notes file found, nothing to migrate")
         return {"success": True, "migrated": 0}
 
-    try:
-        with open(notes_file_path, 'r') as f:
-            legacy_notes = json.load(f)
-    except Exception as e:
-        logger.error(f"Error loading legacy notes: {e}")
-        return {"success": False, "error": str(e)}
+    if file_size == 0:
+        logger.info("Legacy notes file is empty, nothing to migrate")
+        return {"success": True, "migrated": 0}
 
     stats = {
         "success": True,
-        "total": len(legacy_notes),
+        "total": 0,
         "migrated": 0,
         "errors": 0
     }
 
-    for legacy_note in legacy_notes:
+    now_iso = datetime.now().isoformat()
+    batch = []
+    total = errors = 0
+    try:
+        for legacy_note in _iter_json_array(notes_file_path):
+            total += 1
+            try:
+                # Convert to new format
+                note_data = {
+                    **_STATIC_NOTE_FIELDS,
+                    'title': legacy_note.get('title', 'Untitled Note'),
+                    'content': legacy_note.get('content', ''),
+                    'tags': [*legacy_note.get('tags', ()), 'migrated'],
+                    'created': legacy_note.get('created', now_iso),
+                    'updated': legacy_note.get('updated', now_iso)
+                }
+
+                batch.append(note_data)
+            except Exception as e:
+                logger.error(f"Error migrating legacy note: {e}")
+                errors += 1
+    except Exception as e:
+        logger.error(f"Error loading legacy notes: {e}")
+        return {"success": False, "error": str(e)}
+
+    stats["total"] = total
+    stats["errors"] = errors
+
+    # Add to knowledge graph with a single rebuild and save
+    if batch:
         try:
-            # Convert to new format
-            note_data = {
-                'title': legacy_note.get('title', 'Untitled Note'),
-                'content': legacy_note.get('content', ''),
-                'tags': legacy_note.get('tags', []) + ['migrated'],
-                'created': legacy_note.get('created', datetime.now().isoformat()),
-                'updated': legacy_note.get('updated', datetime.now().isoformat()),
-                'type': 'note'
-            }
-
-            # Add to knowledge graph
-            knowledge_graph.add_note(note_data)
-            stats["migrated"] += 1
+            knowledge_graph.add_notes(batch)
+            stats["migrated"] = len(batch)
         except Exception as e:
-            logger.error(f"Error migrating legacy note: {e}")
-            stats["errors"] += 1
+            logger.error(f"Error migrating legacy notes: {e}")
+            stats["errors"] += len(batch)
 
     # If migration was successful, rename the old notes file
     if stats["migrated"] > 0 and stats["errors"] == 0:
-        backup_path = notes_file_path + ".bak"
-        try:
-            Path(notes_file_path).rename(backup_path)
-            logger.info(f"Renamed old notes file to {backup_path}")
-        except Exception as e:
-            logger.warning(f"Could not rename old notes file: {e}")
+        if defer_backup:
+            stats["source_path"] = notes_file_path
+        else:
+            _backup_source(notes_file_path, "notes")
 
     logger.info(
         f"Notes migration complete: {stats['migrated']} notes migrated, {stats['errors']} errors")
     return stats
+
+
+def run_all_migrations(knowledge_graph, data_dir=None):
+    """
+    Run every pending data migration, saving the data file only once.
+
+    The migrations mark the graph dirty, so it is rebuilt once on next access.
+    Source files are renamed to .bak only after the data has been saved, so a
+    failed run is retried on the next start.
+
+    Args:
+        knowledge_graph: The knowledge graph instance
+        data_dir: Optional directory holding the legacy files instead of the
+            default data directory
+
+    Returns:
+        Dict mapping each migration name to its statistics
+    """
+    if data_dir is None:
+        scheduled_tasks_path = _SCHEDULED_TASKS_PATH
+        notes_file_path = _LEGACY_NOTES_PATH
+    else:
+        scheduled_tasks_path = os.path.join(data_dir, "scheduled_tasks.json")
+        notes_file_path = os.path.join(data_dir, "notes.json")
+
+    results = {}
+    # Coalesce the per-migration saves into one write on exit
+    with knowledge_graph.batch():
+        if is_migration_needed(data_dir):
+            results["scheduled_tasks"] = migrate_scheduled_tasks_to_unified_model(
+                knowledge_graph, scheduled_tasks_path=scheduled_tasks_path,
+                defer_backup=True)
+        results["legacy_notes"] = migrate_legacy_notes(
+            knowledge_graph, notes_file_path, defer_backup=True)
+
+    # Reached only once the batch has been flushed without raising
+    for name, label in (("scheduled_tasks", "scheduled tasks"), ("legacy_notes", "notes")):
+        source_path = results.get(name, {}).pop("source_path", None)
+        if source_path:
+            _backup_source(source_path, label)
+
+    return results
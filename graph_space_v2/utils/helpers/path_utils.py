@@ -1,18 +1,36 @@
 import os
 import json
+import logging
+from functools import lru_cache
 from typing import Optional
 
+from graph_space_v2.utils.helpers.file_utils import save_json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
 # Get the absolute path to the graph_space_v2 package directory
 PACKAGE_DIR = os.path.abspath(os.path.join(
     os.path.dirname(__file__), '..', '..'))
 
 # Default data directory
-DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(
-    os.path.dirname(os.path.abspath(__file__)))), 'data')
+DEFAULT_DATA_DIR = os.path.join(PACKAGE_DIR, 'data')
 
 # Default config directory
-DEFAULT_CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(
-    os.path.dirname(os.path.abspath(__file__)))), 'config')
+DEFAULT_CONFIG_DIR = os.path.join(PACKAGE_DIR, 'config')
+
+# Default user data and config files
+USER_DATA_PATH = os.path.join(DEFAULT_DATA_DIR, 'user_data.json')
+CONFIG_PATH = os.path.join(DEFAULT_CONFIG_DIR, 'config.json')
+
+# Whether the default directories have been created in this process
+_DATA_DIR_READY = False
+_CONFIG_DIR_READY = False
 
 
 def get_data_dir() -> str:
@@ -36,35 +54,43 @@ def get_config_dir() -> str:
 
 
 def get_data_file_path(filename: str) -> str:
-    return os.path.join(get_data_dir(), filename)
+    return os.path.join(DEFAULT_DATA_DIR, filename)
 
 
 def get_config_file_path(filename: str) -> str:
-    return os.path.join(get_config_dir(), filename)
+    return os.path.join(DEFAULT_CONFIG_DIR, filename)
 
 
 def get_user_data_path() -> str:
     """
     Get the path to the user data file.
 
+    The data directory is created on the first call only.
+
     Returns:
         Path to the user data file
     """
-    data_dir = get_data_dir()
-    ensure_dir_exists(data_dir)
-    return os.path.join(data_dir, 'user_data.json')
+    global _DATA_DIR_READY
+    if not _DATA_DIR_READY:
+        ensure_dir_exists(DEFAULT_DATA_DIR)
+        _DATA_DIR_READY = True
+    return USER_DATA_PATH
 
 
 def get_config_path() -> str:
     """
     Get the path to the config file.
 
+    The config directory is created on the first call only.
+
     Returns:
         Path to the config file
     """
-    config_dir = get_config_dir()
-    ensure_dir_exists(config_dir)
-    return os.path.join(config_dir, 'config.json')
+    global _CONFIG_DIR_READY
+    if not _CONFIG_DIR_READY:
+        ensure_dir_exists(DEFAULT_CONFIG_DIR)
+        _CONFIG_DIR_READY = True
+    return CONFIG_PATH
 
 
 def ensure_dir_exists(dir_path: str) -> None:
@@ -74,45 +100,36 @@ def ensure_dir_exists(dir_path: str) -> None:
     Args:
         dir_path: Path to the directory
     """
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
+    os.makedirs(dir_path, exist_ok=True)
+
+
+@lru_cache(maxsize=None)
+def _ensure_dir_once(dir_path: str) -> None:
+    """Create a directory at most once per process."""
+    ensure_dir_exists(dir_path)
 
 
 def init_dirs() -> None:
     """
     Initialize all necessary directories.
     """
-    # Create data directory
     data_dir = get_data_dir()
-    print(f"Ensuring data directory exists: {data_dir}")
-    ensure_dir_exists(data_dir)
-    print(f"Data directory exists: {os.path.exists(data_dir)}")
-
-    # Create uploads directory
-    uploads_dir = os.path.join(data_dir, 'uploads')
-    print(f"Ensuring uploads directory exists: {uploads_dir}")
-    ensure_dir_exists(uploads_dir)
-    print(f"Uploads directory exists: {os.path.exists(uploads_dir)}")
-
-    # Create documents directory
-    documents_dir = os.path.join(data_dir, 'documents')
-    print(f"Ensuring documents directory exists: {documents_dir}")
-    ensure_dir_exists(documents_dir)
-    print(f"Documents directory exists: {os.path.exists(documents_dir)}")
-
-    # Create temp directory
-    temp_dir = os.path.join(data_dir, 'temp')
-    print(f"Ensuring temp directory exists: {temp_dir}")
-    ensure_dir_exists(temp_dir)
-    print(f"Temp directory exists: {os.path.exists(temp_dir)}")
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    # Create the data directory and its uploads, documents and temp folders
+    for dir_path in (data_dir,
+                     os.path.join(data_dir, 'uploads'),
+                     os.path.join(data_dir, 'documents'),
+                     os.path.join(data_dir, 'temp')):
+        if debug:
+            logger.debug(f"Ensuring directory exists: {dir_path}")
+        _ensure_dir_once(dir_path)
 
     # Create an empty user data file if it doesn't exist
     user_data_path = get_user_data_path()
     if not os.path.exists(user_data_path) or os.path.getsize(user_data_path) == 0:
-        print(f"Creating empty user data file: {user_data_path}")
-        with open(user_data_path, 'w') as f:
-            json.dump({"notes": [], "tasks": [], "contacts": []}, f)
-        print(f"User data file created: {os.path.exists(user_data_path)}")
+        logger.info(f"Creating empty user data file: {user_data_path}")
+        save_json({"notes": [], "tasks": [], "contacts": []}, user_data_path)
 
 
 def debug_data_file() -> dict:
@@ -130,34 +147,40 @@ def debug_data_file() -> dict:
         print(f"Data file not found at {data_path}, creating new one")
         init_dirs()  # This will create the file with default structure
 
-    # Try to read the file
+    # Read and validate the file first; any repair is written once afterwards
+    needs_write = False
     try:
-        with open(data_path, 'r') as f:
-            content = f.read().strip()
-            if not content:  # Empty file
-                print(
-                    f"Data file at {data_path} is empty, initializing with default structure")
-                data = {"notes": [], "tasks": [],
-                        "contacts": [], "documents": []}
-                with open(data_path, 'w') as fw:
-                    json.dump(data, fw, indent=2)
-                return data
+        with open(data_path, 'rb') as f:
+            # An empty file needs no parsing
+            if os.fstat(f.fileno()).st_size == 0:
+                data = None
+            elif ORJSON_AVAILABLE:
+                data = orjson.loads(f.read())
             else:
-                data = json.loads(content)
-                # Check if documents array exists
-                if "documents" not in data:
-                    print(f"Adding missing documents array to data file")
-                    data["documents"] = []
-                    with open(data_path, 'w') as fw:
-                        json.dump(data, fw, indent=2)
-                return data
+                data = json.load(f)
+
+        if data is None:  # Empty file
+            print(
+                f"Data file at {data_path} is empty, initializing with default structure")
+            data = {"notes": [], "tasks": [],
+                    "contacts": [], "documents": []}
+            needs_write = True
+        elif "documents" not in data:
+            # Check if documents array exists
+            print(f"Adding missing documents array to data file")
+            data["documents"] = []
+            needs_write = True
     except json.JSONDecodeError:
         print(
             f"Data file at {data_path} is corrupted, initializing with default structure")
         data = {"notes": [], "tasks": [], "contacts": [], "documents": []}
-        with open(data_path, 'w') as fw:
-            json.dump(data, fw, indent=2)
-        return data
+        needs_write = True
     except Exception as e:
         print(f"Error reading data file: {e}")
         return {"notes": [], "tasks": [], "contacts": [], "documents": []}
+
+    # Single write point, after the read handle is closed; save_json replaces
+    # the file atomically rather than truncating it in place
+    if needs_write:
+        save_json(data, data_path)
+    return data
@@ -1,6 +1,7 @@
 """Pytest fixtures and stubs for GraphSpace v2 tests."""
 from __future__ import annotations
 
+import copy
 import json
 import sys
 from pathlib import Path
@@ -16,70 +17,84 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:  # pragma: no branch - executes once during import
     sys.path.insert(0, str(ROOT))
 
-if "dotenv" not in sys.modules:  # pragma: no branch - ensures optional dependency
-    dotenv_module = types.ModuleType("dotenv")
-    dotenv_module.load_dotenv = lambda *args, **kwargs: None
-    sys.modules["dotenv"] = dotenv_module
+def _install_stubs() -> None:
+    """Register lightweight stand-ins for heavy optional dependencies once per process."""
+    if "dotenv" not in sys.modules:  # pragma: no branch - ensures optional dependency
+        dotenv_module = types.ModuleType("dotenv")
+        dotenv_module.load_dotenv = lambda *args, **kwargs: None
+        sys.modules["dotenv"] = dotenv_module
 
-if "torch" not in sys.modules:  # pragma: no branch - avoid heavy dependency
-    torch_module = types.ModuleType("torch")
+    if "torch" not in sys.modules:  # pragma: no branch - avoid heavy dependency
+        torch_module = types.ModuleType("torch")
 
-    class _Cuda:
-        @staticmethod
-        def is_available() -> bool:  # pragma: no cover - simple stub
-            return False
+        class _Cuda:
+            @staticmethod
+            def is_available() -> bool:  # pragma: no cover - simple stub
+                return False
 
-    torch_module.cuda = _Cuda()
-    sys.modules["torch"] = torch_module
+        torch_module.cuda = _Cuda()
+        sys.modules["torch"] = torch_module
 
-if "sentence_transformers" not in sys.modules:  # pragma: no branch
-    st_module = types.ModuleType("sentence_transformers")
+    if "sentence_transformers" not in sys.modules:  # pragma: no branch
+        st_module = types.ModuleType("sentence_transformers")
 
-    class _SentenceTransformer:
-        def __init__(self, *args, **kwargs):  # pragma: no cover - trivial stub
-            pass
+        class _SentenceTransformer:
+            def __init__(self, *args, **kwargs):  # pragma: no cover - trivial stub
+                pass
 
-        def encode(self, texts, convert_to_tensor=False):  # pragma: no cover
-            if isinstance(texts, list):
-                return np.zeros((len(texts), 1), dtype=np.float32)
-            return np.zeros((1,), dtype=np.float32)
+            def encode(self, texts, convert_to_tensor=False):  # pragma: no cover
+                if isinstance(texts, list):
+                    return np.zeros((len(texts), 1), dtype=np.float32)
+                return np.zeros((1,), dtype=np.float32)
 
-    st_module.SentenceTransformer = _SentenceTransformer
-    sys.modules["sentence_transformers"] = st_module
+        st_module.SentenceTransformer = _SentenceTransformer
+        sys.modules["sentence_transformers"] = st_module
 
-if "faiss" not in sys.modules:  # pragma: no branch
-    faiss_module = types.ModuleType("faiss")
+    if "faiss" not in sys.modules:  # pragma: no branch
+        faiss_module = types.ModuleType("faiss")
 
-    class _IndexFlatL2:
-        def __init__(self, dimension: int):  # pragma: no cover
-            self.dimension = dimension
+        class _IndexFlatL2:
+            def __init__(self, dimension: int):  # pragma: no cover
+                self.dimension = dimension
 
-        def reset(self) -> None:  # pragma: no cover
-            pass
+            def reset(self) -> None:  # pragma: no cover
+                pass
 
-        def add_with_ids(self, embeddings, ids) -> None:  # pragma: no cover
-            pass
+            def add_with_ids(self, embeddings, ids) -> None:  # pragma: no cover
+                pass
 
-        def search(self, queries, k):  # pragma: no cover
-            return np.zeros((len(queries), k)), np.zeros((len(queries), k))
+            # Shared read-only zeros so searches in tight loops don't allocate
+            _zeros = np.zeros((1024, 32))
+            _zeros.flags.writeable = False
 
-    class _IndexIDMap:
-        def __init__(self, index):  # pragma: no cover
-            self.index = index
+            def search(self, queries, k):  # pragma: no cover
+                n = len(queries)
+                if n <= self._zeros.shape[0] and k <= self._zeros.shape[1]:
+                    return self._zeros[:n, :k], self._zeros[:n, :k]
+                return np.zeros((n, k)), np.zeros((n, k))
 
-    def normalize_L2(vectors):  # pragma: no cover
-        return vectors
+        class _IndexIDMap:
+            def __init__(self, index):  # pragma: no cover
+                self.index = index
 
-    faiss_module.IndexFlatL2 = _IndexFlatL2
-    faiss_module.IndexIDMap = _IndexIDMap
-    faiss_module.normalize_L2 = normalize_L2
-    sys.modules["faiss"] = faiss_module
+        def normalize_L2(vectors):  # pragma: no cover
+            return vectors
 
-    contrib_module = types.ModuleType("faiss.contrib")
-    torch_utils_module = types.ModuleType("faiss.contrib.torch_utils")
-    torch_utils_module.using_gpu = False
-    sys.modules["faiss.contrib"] = contrib_module
-    sys.modules["faiss.contrib.torch_utils"] = torch_utils_module
+        faiss_module.IndexFlatL2 = _IndexFlatL2
+        faiss_module.IndexIDMap = _IndexIDMap
+        faiss_module.normalize_L2 = normalize_L2
+        sys.modules["faiss"] = faiss_module
+
+        contrib_module = types.ModuleType("faiss.contrib")
+        torch_utils_module = types.ModuleType("faiss.contrib.torch_utils")
+        torch_utils_module.using_gpu = False
+        contrib_module.torch_utils = torch_utils_module
+        faiss_module.contrib = contrib_module
+        sys.modules["faiss.contrib"] = contrib_module
+        sys.modules["faiss.contrib.torch_utils"] = torch_utils_module
+
+
+_install_stubs()
 
 from graph_space_v2.core.graph.knowledge_graph import KnowledgeGraph
 
@@ -95,10 +110,20 @@ def data_file(tmp_path: Path) -> Path:
     return data_path
 
 
+@pytest.fixture(scope="session")
+def _empty_kg_template(tmp_path_factory: pytest.TempPathFactory) -> KnowledgeGraph:
+    """Build an empty knowledge graph once to be cloned for each test."""
+    data_path = tmp_path_factory.mktemp("kg_template") / "user_data.json"
+    data_path.write_text(json.dumps({"notes": [], "tasks": [], "contacts": [], "documents": []}))
+    return KnowledgeGraph(str(data_path))
+
+
 @pytest.fixture()
-def knowledge_graph(data_file: Path) -> KnowledgeGraph:
+def knowledge_graph(_empty_kg_template: KnowledgeGraph, data_file: Path) -> KnowledgeGraph:
     """Provide a fresh knowledge graph backed by a temporary file."""
-    return KnowledgeGraph(str(data_file))
+    graph = copy.deepcopy(_empty_kg_template)
+    graph.data_path = str(data_file)
+    return graph
 
 
 class DummyEmbeddingService:
@@ -110,20 +135,38 @@ class DummyEmbeddingService:
         self.deleted_embeddings: List[str] = []
         self.semantic_matches: List[Dict[str, Any]] = []
         self.trained_graph_nodes: List[str] | None = None
+        self.batch_calls: List[Dict[str, Any]] = []
+        self.version = 0
+
+    def reset(self) -> None:
+        """Clear recorded state so the stub can be reused by the next test."""
+        self.stored_embeddings.clear()
+        self.updated_embeddings.clear()
+        self.deleted_embeddings.clear()
+        self.semantic_matches = []
+        self.trained_graph_nodes = None
+        self.batch_calls.clear()
 
     def embed_text(self, text: str) -> str:
         return f"embedding:{text}"
 
     def embed_texts(self, texts: List[str]) -> List[str]:
-        return [self.embed_text(text) for text in texts]
+        return [f"embedding:{text}" for text in texts]
 
     def store_embedding(self, item_id: str, embedding: Any, metadata: Dict[str, Any] | None = None) -> None:
+        self.version += 1
         self.stored_embeddings[item_id] = {
             "embedding": embedding,
             "metadata": metadata or {},
         }
 
+    def store_embeddings_batch(self, item_ids: List[str], vectors: Any, metadatas: List[Dict[str, Any]] | None = None) -> None:
+        self.batch_calls.append({"ids": list(item_ids), "vectors": vectors})
+        for index, item_id in enumerate(item_ids):
+            self.store_embedding(item_id, vectors[index], metadatas[index] if metadatas else None)
+
     def update_embedding(self, item_id: str, embedding: Any, metadata: Dict[str, Any] | None = None) -> bool:
+        self.version += 1
         self.updated_embeddings[item_id] = {
             "embedding": embedding,
             "metadata": metadata or {},
@@ -131,6 +174,7 @@ class DummyEmbeddingService:
         return True
 
     def delete_embedding(self, item_id: str) -> bool:
+        self.version += 1
         self.deleted_embeddings.append(item_id)
         return True
 
@@ -151,6 +195,11 @@ class DummyLLMService:
         self.generated_titles: List[str] = []
         self.tag_inputs: List[str] = []
 
+    def reset(self) -> None:
+        """Clear recorded calls so the stub can be reused by the next test."""
+        self.generated_titles.clear()
+        self.tag_inputs.clear()
+
     def generate_title(self, text: str) -> str:
         self.generated_titles.append(text)
         return f"Title for {text[:10]}".strip()
@@ -172,13 +221,21 @@ class DummyLLMService:
         return "answer"
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def dummy_embedding_service() -> DummyEmbeddingService:
-    """Fixture exposing a fresh embedding stub per test."""
+    """Fixture exposing an embedding stub shared across the session."""
     return DummyEmbeddingService()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def dummy_llm_service() -> DummyLLMService:
-    """Fixture exposing a fresh LLM stub per test."""
+    """Fixture exposing an LLM stub shared across the session."""
     return DummyLLMService()
+
+
+@pytest.fixture(autouse=True)
+def _reset_dummy_services(dummy_embedding_service: DummyEmbeddingService, dummy_llm_service: DummyLLMService):
+    """Reset the shared service stubs after every test."""
+    yield
+    dummy_embedding_service.reset()
+    dummy_llm_service.reset()
@@ -0,0 +1,63 @@
+"""Document processor behaviour with stubbed services."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+import tests.test_graphspace  # noqa: F401 - installs Google client stubs used by the integrations package
+from graph_space_v2.integrations.document.document_processor import DocumentProcessor
+
+from tests.conftest import DummyEmbeddingService
+
+
+class VectorEmbeddingService(DummyEmbeddingService):
+    """Embedding stub that returns fixed-size numeric vectors."""
+
+    def embed_texts(self, texts: List[str]) -> List[np.ndarray]:
+        return [np.full(3, float(index)) for index, _ in enumerate(texts)]
+
+
+def test_chunk_embeddings_are_stored_in_one_batch(tmp_path: Path, monkeypatch) -> None:
+    """All chunks of a document should be stored with a single batched call."""
+    source = tmp_path / "notes.txt"
+    source.write_text("alpha beta gamma")
+    embedding_service = VectorEmbeddingService()
+    processor = DocumentProcessor(
+        embedding_service=embedding_service,
+        storage_dir=str(tmp_path / "documents"),
+    )
+    monkeypatch.setattr(processor, "_chunk_text", lambda text, size: ["alpha", "beta", "gamma"])
+
+    result = processor.process_single_file(str(source))
+
+    assert result["chunks"] == 3
+    assert len(embedding_service.batch_calls) == 1
+    batch = embedding_service.batch_calls[0]
+    assert batch["ids"] == [f"notes.txt_chunk_{index}" for index in range(3)]
+    assert batch["vectors"].shape == (3, 3)
+    assert batch["vectors"].dtype == np.float32
+    assert embedding_service.stored_embeddings["notes.txt_chunk_2"]["metadata"]["content"] == "gamma"
+
+
+def test_int8_quantization_stores_scaled_vectors(tmp_path: Path, monkeypatch) -> None:
+    """int8 quantization should store compact vectors along with their scale."""
+    source = tmp_path / "notes.txt"
+    source.write_text("alpha beta")
+    embedding_service = VectorEmbeddingService()
+    processor = DocumentProcessor(
+        embedding_service=embedding_service,
+        storage_dir=str(tmp_path / "documents"),
+        embedding_quantization="int8",
+    )
+    monkeypatch.setattr(processor, "_chunk_text", lambda text, size: ["alpha", "beta"])
+
+    processor.process_single_file(str(source))
+
+    batch = embedding_service.batch_calls[0]
+    assert batch["vectors"].dtype == np.int8
+    stored = embedding_service.stored_embeddings["notes.txt_chunk_1"]
+    assert stored["metadata"]["quantization"] == "int8"
+    restored = stored["embedding"].astype(np.float32) * stored["metadata"]["scale"]
+    assert np.allclose(restored, np.full(3, 1.0))
@@ -0,0 +1,39 @@
+"""Embedding service storage behaviour with stubbed model and index."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from graph_space_v2.ai.embedding.embedding_service import EmbeddingService, quantize_embeddings
+
+
+def test_update_keeps_quantized_items_consistent(tmp_path: Path) -> None:
+    """Updating an int8 item should re-quantize the new vector and survive a reload."""
+    service = EmbeddingService(dimension=3, storage_path=str(tmp_path))
+    vectors, scales = quantize_embeddings(np.array([[1.0, 2.0, 3.0]]), "int8")
+    service.store_embeddings_batch(
+        ["chunk"], vectors, [{"quantization": "int8", "scale": float(scales[0, 0])}])
+
+    assert service.update_embedding("chunk", np.array([0.5, -4.0, 2.0], dtype=np.float32))
+
+    item = service.embeddings["chunk"]
+    assert item.embedding.dtype == np.int8
+    assert np.allclose(service.get_embedding("chunk"), [0.5, -4.0, 2.0], atol=0.05)
+
+    reloaded = EmbeddingService(dimension=3, storage_path=str(tmp_path))
+    assert np.allclose(reloaded.get_embedding("chunk"), [0.5, -4.0, 2.0], atol=0.05)
+
+
+def test_update_to_float_drops_quantization_metadata(tmp_path: Path) -> None:
+    """Switching an item back to float storage should drop its scale."""
+    service = EmbeddingService(dimension=3, storage_path=str(tmp_path))
+    vectors, scales = quantize_embeddings(np.array([[1.0, 2.0, 3.0]]), "int8")
+    service.store_embeddings_batch(
+        ["chunk"], vectors, [{"quantization": "int8", "scale": float(scales[0, 0])}])
+
+    service.update_embedding("chunk", np.array([0.5, -4.0, 2.0], dtype=np.float32), {"quantization": "none"})
+
+    assert "scale" not in service.embeddings["chunk"].metadata
+    reloaded = EmbeddingService(dimension=3, storage_path=str(tmp_path))
+    assert np.allclose(reloaded.get_embedding("chunk"), [0.5, -4.0, 2.0])
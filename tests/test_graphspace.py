@@ -192,10 +192,11 @@ def _load_graphspace_module():
 class DummyDocumentProcessor:
     """Minimal document processor stub for GraphSpace wiring tests."""
 
-    def __init__(self, llm_service, embedding_service, knowledge_graph):  # pragma: no cover - behaviour not under test
+    def __init__(self, llm_service, embedding_service, knowledge_graph, embedding_quantization="none"):  # pragma: no cover - behaviour not under test
         self.llm_service = llm_service
         self.embedding_service = embedding_service
         self.knowledge_graph = knowledge_graph
+        self.embedding_quantization = embedding_quantization
 
 
 @pytest.fixture()
@@ -3,35 +3,50 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
+import networkx as nx
 import pytest
 
 from graph_space_v2.core.graph.knowledge_graph import KnowledgeGraph
 from graph_space_v2.utils.errors.exceptions import EntityNotFoundError
 
 
-def _load_persisted_data(path: Path) -> dict:
-    return json.loads(path.read_text())
+def _load_persisted_data(kg: KnowledgeGraph) -> dict:
+    return kg.snapshot_dict()
 
 
-def test_add_update_delete_note_persists_changes(knowledge_graph: KnowledgeGraph, data_file: Path) -> None:
-    """Notes should be stored, updated, and deleted both in memory and on disk."""
-    note_id = knowledge_graph.add_note({
-        "title": "Research",
-        "content": "Investigate vector databases",
-        "tags": ["ai", "research"],
-    })
-    assert knowledge_graph.get_note(note_id)["title"] == "Research"
+@lru_cache(maxsize=8)
+def _parse_data_file(path: str, inode: int, mtime_ns: int) -> dict:
+    return json.loads(Path(path).read_bytes())
+
 
-    knowledge_graph.update_note(note_id, {"title": "Updated title"})
-    assert knowledge_graph.get_note(note_id)["title"] == "Updated title"
+def _read_data_file(path: Path) -> dict:
+    # Saves replace the file, so the inode and mtime change on every write
+    stat = path.stat()
+    return _parse_data_file(str(path), stat.st_ino, stat.st_mtime_ns)
 
-    persisted = _load_persisted_data(data_file)
+
+def test_add_update_delete_note_persists_changes(knowledge_graph: KnowledgeGraph, data_file: Path) -> None:
+    """Notes should be stored, updated, and deleted both in memory and on disk."""
+    with knowledge_graph.batch():
+        note_id = knowledge_graph.add_note({
+            "title": "Research",
+            "content": "Investigate vector databases",
+            "tags": ["ai", "research"],
+        })
+        assert knowledge_graph.get_note(note_id)["title"] == "Research"
+
+        knowledge_graph.update_note(note_id, {"title": "Updated title"})
+        assert knowledge_graph.get_note(note_id)["title"] == "Updated title"
+
+    persisted = _read_data_file(data_file)
     assert persisted["notes"][0]["title"] == "Updated title"
 
     assert knowledge_graph.delete_note(note_id) is True
     assert knowledge_graph.get_note(note_id) is None
+    assert _read_data_file(data_file)["notes"] == []
 
 
 def test_task_and_note_relationships_support_lookup(knowledge_graph: KnowledgeGraph) -> None:
@@ -70,19 +85,23 @@ def test_manual_relationship_creation_updates_graph(knowledge_graph: KnowledgeGr
 
 def test_update_node_and_delete_node_manage_entities(knowledge_graph: KnowledgeGraph, data_file: Path) -> None:
     """Generic node updates should mutate stored entities and support removal."""
-    task_id = knowledge_graph.add_task({
-        "title": "Status report",
-        "description": "Share weekly update",
-        "tags": ["status"],
-    })
+    with knowledge_graph.batch():
+        task_id = knowledge_graph.add_task({
+            "title": "Status report",
+            "description": "Share weekly update",
+            "tags": ["status"],
+        })
+
+        assert knowledge_graph.update_node(task_id, {"title": "Weekly status"}) is True
+        assert knowledge_graph.get_task(task_id)["title"] == "Weekly status"
 
-    assert knowledge_graph.update_node(task_id, {"title": "Weekly status"}) is True
-    assert knowledge_graph.get_task(task_id)["title"] == "Weekly status"
+    assert _read_data_file(data_file)["tasks"][0]["title"] == "Weekly status"
 
-    assert knowledge_graph.delete_node(task_id) is True
-    assert knowledge_graph.get_task(task_id) is None
+    with knowledge_graph.batch():
+        assert knowledge_graph.delete_node(task_id) is True
+        assert knowledge_graph.get_task(task_id) is None
 
-    persisted = _load_persisted_data(data_file)
+    persisted = _read_data_file(data_file)
     assert persisted["tasks"] == []
 
 
@@ -106,20 +125,21 @@ def test_remove_all_relationships_clears_edges(knowledge_graph: KnowledgeGraph)
     assert list(knowledge_graph.graph.neighbors(node_id)) == []
 
 
-def test_add_and_retrieve_document(knowledge_graph: KnowledgeGraph, data_file: Path) -> None:
+def test_add_and_retrieve_document(knowledge_graph: KnowledgeGraph) -> None:
     """Documents should be persisted and retrievable like other entities."""
-    document_id = knowledge_graph.add_document({
-        "id": "doc1",
-        "title": "Spec",
-        "content": "Functional spec",
-        "tags": ["spec"],
-        "topics": ["architecture"],
-    })
-
-    stored = knowledge_graph.get_document(document_id)
-    assert stored["title"] == "Spec"
-
-    persisted = _load_persisted_data(data_file)
+    with knowledge_graph.batch():
+        document_id = knowledge_graph.add_document({
+            "id": "doc1",
+            "title": "Spec",
+            "content": "Functional spec",
+            "tags": ["spec"],
+            "topics": ["architecture"],
+        })
+
+        stored = knowledge_graph.get_document(document_id)
+        assert stored["title"] == "Spec"
+
+    persisted = _load_persisted_data(knowledge_graph)
     assert persisted["documents"][0]["id"] == "doc1"
 
 
@@ -132,3 +152,163 @@ def test_find_path_raises_for_missing_nodes(knowledge_graph: KnowledgeGraph) ->
 def test_remove_relationship_missing_node_returns_false(knowledge_graph: KnowledgeGraph) -> None:
     """Removing relationships for a non-existent node should fail gracefully."""
     assert knowledge_graph.remove_all_relationships("nonexistent") is False
+
+
+def test_add_notes_batch_persists_all_notes(knowledge_graph: KnowledgeGraph) -> None:
+    """Batched notes should all be stored, linked, and persisted in one save."""
+    note_ids = knowledge_graph.add_notes([
+        {"title": "First", "content": "", "tags": ["batch"]},
+        {"title": "Second", "content": "", "tags": ["batch"]},
+    ])
+
+    assert len(note_ids) == 2
+    assert [note["id"] for note in _load_persisted_data(knowledge_graph)["notes"]] == note_ids
+    assert {result["id"] for result in knowledge_graph.search_by_tag("batch")} == set(note_ids)
+    assert knowledge_graph.add_notes([]) == []
+
+
+def test_mark_dirty_defers_rebuild_until_graph_access(knowledge_graph: KnowledgeGraph) -> None:
+    """Raw data changes should only appear in the graph after it is next accessed."""
+    knowledge_graph.data["notes"].append({"id": "raw", "title": "Raw", "content": "", "tags": []})
+    knowledge_graph.mark_dirty()
+
+    assert knowledge_graph._dirty is True
+    assert knowledge_graph.graph.has_node("note_raw")
+    assert knowledge_graph._dirty is False
+
+
+def test_persistence_round_trip(knowledge_graph: KnowledgeGraph, data_file: Path) -> None:
+    """Batched mutations should reach disk on exit, matching the in-memory snapshot."""
+    with knowledge_graph.batch():
+        knowledge_graph.add_note({"title": "Pending", "content": "", "tags": []})
+        assert _read_data_file(data_file)["notes"] == []
+
+    persisted = _read_data_file(data_file)
+    assert persisted["notes"][0]["title"] == "Pending"
+    assert persisted == knowledge_graph.snapshot_dict()
+    assert KnowledgeGraph(str(data_file)).get_note(persisted["notes"][0]["id"])["title"] == "Pending"
+
+
+def test_mutations_defer_graph_rebuild(knowledge_graph: KnowledgeGraph) -> None:
+    """Adding entities should only rebuild the graph when it is next queried."""
+    note_id = knowledge_graph.add_note({"title": "Lazy", "content": "", "tags": []})
+    assert knowledge_graph._dirty is True
+    assert knowledge_graph.get_note(note_id)["title"] == "Lazy"
+
+    assert knowledge_graph.graph.has_node(f"note_{note_id}")
+    assert knowledge_graph._dirty is False
+
+
+def test_find_path_returns_empty_when_unreachable(knowledge_graph: KnowledgeGraph) -> None:
+    """Disconnected entities should yield an empty path rather than an error."""
+    first = knowledge_graph.add_note({"title": "Island A", "content": "", "tags": ["a"]})
+    second = knowledge_graph.add_note({"title": "Island B", "content": "", "tags": ["b"]})
+
+    assert knowledge_graph.find_path(first, "note", second, "note") == []
+    assert [segment["id"] for segment in knowledge_graph.find_path(first, "note", first, "note")] == [first]
+
+
+def test_find_path_tracks_component_changes(knowledge_graph: KnowledgeGraph) -> None:
+    """Component labels should follow relationships added and removed after a query."""
+    first = knowledge_graph.add_note({"title": "A", "content": "", "tags": []})
+    second = knowledge_graph.add_note({"title": "B", "content": "", "tags": []})
+    assert knowledge_graph.find_path(first, "note", second, "note") == []
+
+    knowledge_graph.add_relationship(first, second, "linked")
+    assert [segment["id"] for segment in knowledge_graph.find_path(first, "note", second, "note")] == [first, second]
+
+    knowledge_graph.remove_all_relationships(first)
+    assert knowledge_graph.find_path(first, "note", second, "note") == []
+
+
+def test_find_path_sees_edges_added_directly(knowledge_graph: KnowledgeGraph) -> None:
+    """Edges added on the networkx graph itself should not be hidden by stale labels."""
+    first = knowledge_graph.add_note({"title": "A", "content": "", "tags": []})
+    second = knowledge_graph.add_note({"title": "B", "content": "", "tags": []})
+    assert knowledge_graph.find_path(first, "note", second, "note") == []
+
+    knowledge_graph.graph.add_edge(f"note_{first}", f"note_{second}", relationship="linked")
+    assert [segment["id"] for segment in knowledge_graph.find_path(first, "note", second, "note")] == [first, second]
+
+
+
+def test_find_path_sees_edge_swapped_without_count_change(knowledge_graph: KnowledgeGraph) -> None:
+    """Removing one edge and adding another should still refresh the component labels."""
+    first = knowledge_graph.add_note({"title": "A", "content": "", "tags": []})
+    second = knowledge_graph.add_note({"title": "B", "content": "", "tags": []})
+    third = knowledge_graph.add_note({"title": "C", "content": "", "tags": []})
+    knowledge_graph.graph.add_edge(f"note_{first}", f"note_{second}", relationship="linked")
+    assert knowledge_graph.find_path(first, "note", third, "note") == []
+
+    knowledge_graph.graph.remove_edge(f"note_{first}", f"note_{second}")
+    knowledge_graph.graph.add_edge(f"note_{first}", f"note_{third}", relationship="linked")
+    assert [segment["id"] for segment in knowledge_graph.find_path(first, "note", third, "note")] == [first, third]
+
+def test_graph_setter_resets_derived_indexes(knowledge_graph: KnowledgeGraph) -> None:
+    """Replacing the graph should rebuild the tag index and component labels."""
+    knowledge_graph.add_note({"title": "Old", "content": "", "tags": ["old"]})
+    assert knowledge_graph.search_by_tag("old")
+
+    replacement = nx.Graph()
+    replacement.add_node("note_a", type="note", data={"id": "a"}, tags=["new"])
+    replacement.add_node("note_b", type="note", data={"id": "b"}, tags=[])
+    replacement.add_edge("note_a", "note_b")
+    knowledge_graph.graph = replacement
+
+    assert knowledge_graph.search_by_tag("old") == []
+    assert [result["id"] for result in knowledge_graph.search_by_tag("new")] == ["a"]
+    assert [segment["id"] for segment in knowledge_graph.find_path("a", "note", "b", "note")] == ["a", "b"]
+
+
+def test_run_all_migrations_saves_once(knowledge_graph: KnowledgeGraph, data_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Migrating tasks and notes together should write the data file once."""
+    from graph_space_v2.utils.helpers import migration_utils
+
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    (legacy_dir / "scheduled_tasks.json").write_text(json.dumps([{"title": "Standup", "frequency": "daily"}]))
+    (legacy_dir / "notes.json").write_text(json.dumps([{"title": "Old note", "content": ""}]))
+
+    from graph_space_v2.core.graph import knowledge_graph as kg_module
+
+    writes = []
+    original_save_json = kg_module.save_json
+
+    def recording_save_json(data, path):
+        # The sources must still be in place while the data is written
+        assert (legacy_dir / "notes.json").exists()
+        writes.append(path)
+        original_save_json(data, path)
+
+    monkeypatch.setattr(kg_module, "save_json", recording_save_json)
+
+    results = migration_utils.run_all_migrations(knowledge_graph, data_dir=str(legacy_dir))
+
+    assert results["scheduled_tasks"]["migrated"] == 1
+    assert results["legacy_notes"]["migrated"] == 1
+    assert writes == [str(data_file)]
+    assert sorted(path.name for path in legacy_dir.iterdir()) == ["notes.json.bak", "scheduled_tasks.json.bak"]
+    persisted = _read_data_file(data_file)
+    assert [task["title"] for task in persisted["tasks"]] == ["Standup"]
+    assert [note["title"] for note in persisted["notes"]] == ["Old note"]
+    assert knowledge_graph._dirty is True
+
+
+def test_run_all_migrations_keeps_sources_when_save_fails(knowledge_graph: KnowledgeGraph, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failed save should leave the legacy files in place for the next run."""
+    from graph_space_v2.core.graph import knowledge_graph as kg_module
+    from graph_space_v2.utils.helpers import migration_utils
+
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    (legacy_dir / "notes.json").write_text(json.dumps([{"title": "Old note", "content": ""}]))
+
+    def failing_save_json(data, path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(kg_module, "save_json", failing_save_json)
+
+    with pytest.raises(OSError):
+        migration_utils.run_all_migrations(knowledge_graph, data_dir=str(legacy_dir))
+
+    assert sorted(path.name for path in legacy_dir.iterdir()) == ["notes.json"]
@@ -63,3 +63,61 @@ def test_semantic_search_falls_back_to_text(knowledge_graph) -> None:
 
     results = service.semantic_search("authentication")
     assert results  # falls back to text search
+
+
+def test_text_search_index_refreshes_after_mutation(knowledge_graph) -> None:
+    """Entities added after a search should be found by the next search."""
+    _populate_sample_data(knowledge_graph)
+    service = QueryService(knowledge_graph)
+    assert service.text_search("retrospective") == []
+
+    note_id = knowledge_graph.add_note({"title": "Sprint retrospective", "content": "", "tags": []})
+    assert [result["id"] for result in service.text_search("retro")] == [note_id]
+
+
+
+def test_text_search_skips_missing_fields_and_unrequested_types(knowledge_graph) -> None:
+    """None fields should not break the search, and only requested types are indexed."""
+    note_id = knowledge_graph.add_note({"title": "Quarterly planning", "content": "", "tags": []})
+    knowledge_graph.get_note(note_id)["content"] = None
+    knowledge_graph.mark_dirty()
+    service = QueryService(knowledge_graph)
+
+    assert [result["id"] for result in service.text_search("planning", ["note"])] == [note_id]
+    assert service.text_search("pl", ["note"])[0]["id"] == note_id
+    assert set(service._search_indexes) == {"note"}
+
+def test_semantic_cache_reuses_similar_queries(knowledge_graph) -> None:
+    """Cached semantic results should be reused until the graph or embeddings change."""
+    task_id = _populate_sample_data(knowledge_graph)[0]
+
+    class VectorEmbeddingService(DummyEmbeddingService):
+        def __init__(self) -> None:
+            super().__init__()
+            self.search_calls = 0
+
+        def embed_text(self, text: str) -> List[float]:
+            return [1.0, 0.01 * len(text)]
+
+        def search(self, query_embedding, max_results, filter_by=None):
+            self.search_calls += 1
+            return super().search(query_embedding, max_results, filter_by)
+
+    embeddings = VectorEmbeddingService()
+    embeddings.semantic_matches = [{"id": task_id, "score": 0.9, "metadata": {"type": "task"}}]
+    service = QueryService(knowledge_graph, embeddings, None, semantic_cache_size=4)
+
+    assert service.semantic_search("docs")[0]["id"] == task_id
+    assert service.semantic_search("docs")[0]["id"] == task_id
+    assert service.semantic_search("doc")[0]["id"] == task_id
+    assert embeddings.search_calls == 1
+
+    knowledge_graph.add_note({"title": "New", "content": "", "tags": []})
+    service.semantic_search("docs")
+    assert embeddings.search_calls == 2
+
+    service.semantic_search("docs")
+    assert embeddings.search_calls == 2
+    embeddings.update_embedding(task_id, [0.0, 1.0])
+    service.semantic_search("docs")
+    assert embeddings.search_calls == 3
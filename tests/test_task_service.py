@@ -18,17 +18,29 @@ def task_service(knowledge_graph, dummy_embedding_service, dummy_llm_service):
     return TaskService(knowledge_graph, dummy_embedding_service, dummy_llm_service)
 
 
-def test_add_task_uses_llm_and_embeddings(task_service: TaskService, knowledge_graph, dummy_embedding_service: DummyEmbeddingService, dummy_llm_service: DummyLLMService) -> None:
-    """Tasks added via dictionaries should be enriched by the LLM and embedded."""
-    task_id = task_service.add_task({
+@pytest.mark.parametrize(
+    "llm_on, emb_on, expected_title",
+    [
+        (False, False, ""),
+        (True, True, "Title for Prepare on"),
+    ],
+)
+def test_add_task_uses_llm_and_embeddings(llm_on: bool, emb_on: bool, expected_title: str, knowledge_graph, dummy_embedding_service: DummyEmbeddingService, dummy_llm_service: DummyLLMService) -> None:
+    """Tasks added via dictionaries should only be enriched by the services that are wired in."""
+    service = TaskService(
+        knowledge_graph,
+        dummy_embedding_service if emb_on else None,
+        dummy_llm_service if llm_on else None,
+    )
+    task_id = service.add_task({
         "description": "Prepare onboarding email",
         "tags": [],
     })
 
     stored = knowledge_graph.get_task(task_id)
-    assert stored["title"].startswith("Title for")
-    assert dummy_embedding_service.stored_embeddings
-    assert dummy_llm_service.generated_titles == ["Prepare onboarding email"]
+    assert stored["title"] == expected_title
+    assert bool(dummy_embedding_service.stored_embeddings) is emb_on
+    assert dummy_llm_service.generated_titles == (["Prepare onboarding email"] if llm_on else [])
 
 
 def test_get_all_tasks_returns_models(task_service: TaskService) -> None:
@@ -68,30 +80,32 @@ def test_mark_task_completed_and_in_progress(task_service: TaskService, knowledg
 
 def test_task_filters_and_queries(task_service: TaskService) -> None:
     """Filtering helpers should return the expected subsets."""
-    task_service.add_task({
-        "title": "Pending",
-        "description": "",
-        "status": Task.STATUS_PENDING,
-        "project": "Alpha",
-        "tags": ["team"],
-    })
-    in_progress_id = task_service.add_task({
-        "title": "Active",
-        "description": "",
-        "status": Task.STATUS_IN_PROGRESS,
-        "priority": Task.PRIORITY_HIGH,
-        "due_date": (datetime.now() + timedelta(days=1)).isoformat(),
-        "tags": ["team"],
-        "project": "Alpha",
-    })
-    overdue_id = task_service.add_task({
-        "title": "Overdue",
-        "description": "",
-        "status": Task.STATUS_PENDING,
-        "due_date": (datetime.now() - timedelta(days=2)).isoformat(),
-        "tags": ["urgent"],
-        "project": "Beta",
-    })
+    _, in_progress_id, overdue_id = task_service.add_tasks([
+        {
+            "title": "Pending",
+            "description": "",
+            "status": Task.STATUS_PENDING,
+            "project": "Alpha",
+            "tags": ["team"],
+        },
+        {
+            "title": "Active",
+            "description": "",
+            "status": Task.STATUS_IN_PROGRESS,
+            "priority": Task.PRIORITY_HIGH,
+            "due_date": (datetime.now() + timedelta(days=1)).isoformat(),
+            "tags": ["team"],
+            "project": "Alpha",
+        },
+        {
+            "title": "Overdue",
+            "description": "",
+            "status": Task.STATUS_PENDING,
+            "due_date": (datetime.now() - timedelta(days=2)).isoformat(),
+            "tags": ["urgent"],
+            "project": "Beta",
+        },
+    ])
 
     assert {task.id for task in task_service.get_tasks_by_status(Task.STATUS_IN_PROGRESS)} == {in_progress_id}
     assert {task.id for task in task_service.get_tasks_by_project("Alpha")} >= {in_progress_id}
@@ -104,8 +118,11 @@ def test_task_filters_and_queries(task_service: TaskService) -> None:
 
 def test_search_tasks_semantic_and_fallback(task_service: TaskService, dummy_embedding_service: DummyEmbeddingService) -> None:
     """Semantic search should use embeddings when available and fall back otherwise."""
-    first_id = task_service.add_task({"title": "Documentation", "description": "Write API docs"})
-    task_service.add_task({"title": "Review", "description": "Review PR"})
+    first_id, _ = task_service.add_tasks([
+        {"title": "Documentation", "description": "Write API docs"},
+        {"title": "Review", "description": "Review PR"},
+    ])
+    assert len(dummy_embedding_service.batch_calls) == 1
 
     dummy_embedding_service.semantic_matches = [
         {"id": first_id, "score": 0.9, "snippet": "", "metadata": {"type": "task"}},
@@ -144,3 +161,54 @@ def test_delete_task_removes_embeddings(task_service: TaskService, dummy_embeddi
     task_id = task_service.add_task({"title": "Cleanup", "description": ""})
     assert task_service.delete_task(task_id) is True
     assert task_id in dummy_embedding_service.deleted_embeddings
+
+
+def test_task_filters_follow_updates(task_service: TaskService) -> None:
+    """Indexed filters should reflect status and tag changes after an update."""
+    task_id = task_service.add_task({"title": "Indexed", "description": "", "tags": ["old"]})
+    assert [task.id for task in task_service.get_tasks_by_tag("old")] == [task_id]
+
+    task_service.update_task(task_id, {"status": Task.STATUS_COMPLETED, "tags": ["new"]})
+    assert task_service.get_tasks_by_tag("old") == []
+    assert [task.id for task in task_service.get_tasks_by_tag("new")] == [task_id]
+    assert [task.id for task in task_service.get_tasks_by_status(Task.STATUS_COMPLETED)] == [task_id]
+
+
+def test_full_dict_update_still_advances_timestamp(task_service: TaskService, knowledge_graph) -> None:
+    """Updates carrying the old updated_at should still be re-stamped by the graph."""
+    task_id = task_service.add_task({"title": "Stamp", "description": "", "updated_at": "2000-01-01T00:00:00"})
+
+    task_service.mark_task_in_progress(task_id)
+    assert knowledge_graph.get_task(task_id)["updated_at"] != "2000-01-01T00:00:00"
+
+
+def test_due_filters_follow_status_and_due_date_changes(task_service: TaskService, knowledge_graph) -> None:
+    """Overdue and due-soon results should track updates made after a query."""
+    task_id = task_service.add_task({
+        "title": "Report",
+        "description": "",
+        "due_date": (datetime.now() - timedelta(days=1)).isoformat(),
+    })
+    assert [task.id for task in task_service.get_overdue_tasks()] == [task_id]
+
+    knowledge_graph.update_task(task_id, {"due_date": (datetime.now() + timedelta(days=1)).isoformat()})
+    assert task_service.get_overdue_tasks() == []
+    assert [task.id for task in task_service.get_tasks_due_soon(2)] == [task_id]
+
+    task_service.mark_task_completed(task_id)
+    assert task_service.get_tasks_due_soon(2) == []
+    assert [task.id for task in task_service.get_tasks_by_status(Task.STATUS_COMPLETED)] == [task_id]
+
+
+def test_filters_skip_tasks_edited_in_place(task_service: TaskService, knowledge_graph) -> None:
+    """Edits to the live task dict should not leave stale entries in the results."""
+    task_id = task_service.add_task({
+        "title": "Live",
+        "description": "",
+        "due_date": (datetime.now() - timedelta(days=1)).isoformat(),
+    })
+    assert [task.id for task in task_service.get_overdue_tasks()] == [task_id]
+
+    knowledge_graph.get_task(task_id)["status"] = Task.STATUS_COMPLETED
+    assert task_service.get_overdue_tasks() == []
+    assert task_service.get_tasks_by_status(Task.STATUS_PENDING) == []